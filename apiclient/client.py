@@ -1,47 +1,807 @@
+import asyncio
+import codecs
+import heapq
+import itertools
+import json
+import math
+import re
+import socket
+import threading
+import time
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from requests.exceptions import RequestException
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from pyutils.cachingutils.caching import Cache, RedisCache
 from pyutils.logger.logger import Logger
-from pyutils.retrylogic.retry import Retry
+from pyutils.retrylogic.retry import CircuitBreaker, Retry
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _preview(body: bytes, limit: Optional[int]) -> str:
+    """Decodes at most `limit` bytes of a body for logging."""
+    if limit is None or len(body) <= limit:
+        return body.decode('utf-8', 'replace')
+    return f"{body[:limit].decode('utf-8', 'replace')}... [{len(body) - limit} more bytes]"
+
+
+def iter_lines(chunks: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[str]:
+    """Splits a stream of byte chunks into lines without holding more than one partial line."""
+    decoder = codecs.getincrementaldecoder(encoding)('replace')
+    pending = ''
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending.rstrip('\r')
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[Any]:
+    """
+    Incrementally parses a top-level JSON array, yielding each element as soon as it is complete.
+
+    Only the unparsed tail of the stream is buffered, so memory is bounded by the
+    largest single element rather than by the whole document.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ''
+    state = 'start'
+    eof = False
+    chunks = iter(chunks)
+    while not eof:
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer += text_decoder.decode(b'', final=True)
+        else:
+            buffer += text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            if state == 'start':
+                if buffer[pos] != '[':
+                    raise ValueError("Expected a top-level JSON array.")
+                pos += 1
+                state = 'first'
+            elif state == 'first' and buffer[pos] == ']':
+                pos += 1
+                state = 'done'
+            elif state in ('first', 'value'):
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break
+                # A number cut by a chunk boundary parses as a shorter number, so only accept
+                # a value once the character after it is visible and ends it.
+                if not eof and (end == len(buffer) or buffer[end] not in ',] \t\n\r'):
+                    break
+                yield value
+                pos = end
+                state = 'separator'
+            elif state == 'separator':
+                if buffer[pos] == ',':
+                    state = 'value'
+                elif buffer[pos] == ']':
+                    state = 'done'
+                else:
+                    raise ValueError(f"Expected ',' or ']' in JSON array, found {buffer[pos]!r}.")
+                pos += 1
+            else:
+                raise ValueError("Unexpected data after the JSON array.")
+        buffer = buffer[pos:]
+    if state != 'done':
+        raise ValueError("Truncated JSON array.")
+
+
+class ResponseCache:
+    """
+    Stores GET response bodies with their validators for `HttpClient`.
+
+    A fresh entry (within `Cache-Control: max-age`) is served without a request.
+    A stale entry is revalidated with `If-None-Match`/`If-Modified-Since`, and a
+    304 reuses the stored body. Entries are kept in `store` for `max_stale`
+    seconds past freshness so they can still be revalidated. `store` is a
+    `Cache` (the default) or a `RedisCache` created with a pickle or msgpack codec.
+    """
+
+    def __init__(self, store: Any = None, default_ttl: float = 0.0, max_stale: float = 86400.0):
+        if isinstance(store, RedisCache) and store.codec is None:
+            raise ValueError("A RedisCache used as response store needs a codec, e.g. codec='pickle'.")
+        self.store = store if store is not None else Cache(max_size=1024)
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]]) -> str:
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+        return f"http:GET:{url}"
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(key)
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        return entry['expires_at'] > time.time()
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _freshness(self, response: requests.Response) -> Optional[float]:
+        """Seconds the response may be served without revalidation, or None if it must not be stored."""
+        directives = {}
+        for part in response.headers.get('Cache-Control', '').split(','):
+            name, _, value = part.strip().partition('=')
+            if name:
+                directives[name.lower()] = value.strip('"')
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0.0
+        try:
+            return float(directives['max-age'])
+        except (KeyError, ValueError):
+            return self.default_ttl
+
+    def store_response(self, key: str, response: requests.Response) -> None:
+        freshness = self._freshness(response)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if freshness is None or (freshness <= 0 and not etag and not last_modified):
+            return
+        entry = {
+            'body': response.content,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires_at': time.time() + freshness,
+        }
+        self.store.set(key, entry, math.ceil(freshness + self.max_stale))
+
+    def refresh(self, key: str, entry: Dict[str, Any], response: requests.Response) -> None:
+        """Extends a stored entry after a 304, taking any updated validators from the response."""
+        freshness = self._freshness(response)
+        if freshness is None:
+            return
+        entry = dict(entry,
+                     etag=response.headers.get('ETag', entry.get('etag')),
+                     last_modified=response.headers.get('Last-Modified', entry.get('last_modified')),
+                     expires_at=time.time() + freshness)
+        self.store.set(key, entry, math.ceil(freshness + self.max_stale))
+
+
+class HedgePolicy:
+    """
+    Decides when `HttpClient` sends a backup attempt for a slow idempotent request.
+
+    The hedge delay is either fixed (`delay`) or the `percentile` of recently
+    observed latencies, falling back to `initial_delay` until `min_samples`
+    requests have completed. Every request earns `budget` hedge tokens (capped
+    at `max_tokens`) and every hedge spends one, so hedges stay below roughly
+    `budget` of total traffic. Primary attempts run on the caller's thread;
+    `max_workers` only bounds the pool that runs backup attempts.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+    def __init__(self,
+                 delay: Optional[float] = None,
+                 percentile: float = 95.0,
+                 initial_delay: float = 0.1,
+                 min_samples: int = 20,
+                 max_hedges: int = 1,
+                 budget: float = 0.1,
+                 max_tokens: float = 10.0,
+                 window: int = 1000,
+                 max_workers: int = 32):
+        self.delay = delay
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.budget = budget
+        self.max_tokens = max_tokens
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._tokens = max_tokens
+        self._latencies: deque = deque(maxlen=window)
+        self._samples = 0
+        self._cached_delay = initial_delay
+        self._lock = threading.Lock()
+
+    def begin(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.max_tokens, self._tokens + self.budget)
+
+    def try_hedge(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedges += 1
+            return True
+
+    def record(self, latency: float, hedged_win: bool) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._samples += 1
+            if hedged_win:
+                self.hedge_wins += 1
+            # Re-sorting the window on every request would dominate the cost; refresh periodically.
+            # Count samples separately: once the window is full its length no longer changes.
+            if len(self._latencies) >= self.min_samples and self._samples % 16 == 0:
+                ordered = sorted(self._latencies)
+                index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100.0))
+                self._cached_delay = ordered[index]
+
+    def hedge_delay(self) -> float:
+        return self.delay if self.delay is not None else self._cached_delay
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'requests': self.requests, 'hedges': self.hedges, 'hedge_wins': self.hedge_wins,
+                    'hedge_delay': self.hedge_delay()}
+
+
+def is_dependency_failure(error: BaseException) -> bool:
+    """True for connection errors, timeouts and 5xx responses: failures of the server, not of the request."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is None or error.response.status_code >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def _is_retryable(error: BaseException) -> bool:
+    # A 4xx response will not change on a retry.
+    return not (isinstance(error, requests.HTTPError) and error.response is not None
+                and error.response.status_code < 500)
+
+
+class _AttemptSlot:
+    """The connection a hedged attempt is using, so the winning attempt can abort the others."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn: Any = None
+        self.aborted = False
+
+    def attach(self, conn: Any) -> None:
+        with self._lock:
+            if self.aborted:
+                raise ConnectionAbortedError("Hedged attempt abandoned.")
+            self._conn = conn
+
+    def detach(self) -> None:
+        with self._lock:
+            self._conn = None
+
+    def abort(self) -> None:
+        with self._lock:
+            self.aborted = True
+            sock = getattr(self._conn, 'sock', None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)  # wakes the attempt blocked on this socket
+                except OSError:
+                    pass
+
+
+_current_slot = threading.local()
+
+
+class _AbortableRequests:
+    # Exposes the connection of a hedged attempt for as long as it waits on the
+    # server; it is detached before the connection can go back to the pool.
+    def _make_request(self, conn: Any, *args: Any, **kwargs: Any) -> Any:
+        slot: Optional[_AttemptSlot] = getattr(_current_slot, 'slot', None)
+        if slot is None:
+            return super()._make_request(conn, *args, **kwargs)
+        slot.attach(conn)
+        try:
+            return super()._make_request(conn, *args, **kwargs)
+        finally:
+            slot.detach()
+
+
+class _AbortableHTTPConnectionPool(_AbortableRequests, HTTPConnectionPool):
+    pass
+
+
+class _AbortableHTTPSConnectionPool(_AbortableRequests, HTTPSConnectionPool):
+    pass
+
+
+class _HedgingAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _AbortableHTTPConnectionPool,
+                                                   'https': _AbortableHTTPSConnectionPool}
+
+
+class _Timers:
+    """One daemon thread that runs short callbacks once their delay has passed."""
+
+    def __init__(self):
+        self._heap: List[Any] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        with self._condition:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), callback))
+            if self._thread is None:
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name='HttpClientHedgeTimer', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._closed = True
+            self._heap.clear()
+            self._condition.notify()
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._condition.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                if self._closed:
+                    return
+                _, _, callback = heapq.heappop(self._heap)
+            try:
+                callback()
+            except Exception as e:
+                Logger.error("Hedge timer callback failed: %s", e)
+
+
+class _HedgedCall:
+    """Shared state of one hedged request: its attempts and the first successful response."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.primary = _AttemptSlot()
+        self.backups: List[_AttemptSlot] = []
+        self.running = 0
+        self.hedges = 0
+        self.primary_done = False
+        self.finished = False
+        self.response: Optional[requests.Response] = None
+        self.backup_won = False
+        self.error: Optional[BaseException] = None
 
 
 class HttpClient:
-    def __init__(self, 
-                 base_url: str, 
-                 timeout: float = 5.0, 
-                 max_retries: int = 3, 
-                 retry_delay: float = 1.0, 
-                 retry_backoff: float = 2.0):
+    """
+    Synchronous JSON client over a pooled keep-alive session.
+
+    With `circuit_breaker`, only connection errors, timeouts and 5xx responses
+    count as failures of the upstream (see `is_dependency_failure`); 4xx
+    responses still raise but never open the circuit. The predicate applies to
+    this client's calls only and the breaker itself is left unchanged; one
+    constructed with its own `is_failure` keeps it. 4xx responses are not retried.
+    """
+
+    def __init__(self,
+                 base_url: str,
+                 timeout: float = 5.0,
+                 max_retries: int = 3,
+                 retry_delay: float = 1.0,
+                 retry_backoff: float = 2.0,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 headers: Optional[Dict[str, str]] = None,
+                 log_body_limit: Optional[int] = 1024,
+                 response_cache: Optional[ResponseCache] = None,
+                 hedge: Optional[HedgePolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.retry_backoff = retry_backoff
+        self.log_body_limit = log_body_limit
+        self.response_cache = response_cache
+        self.hedge = hedge
+        self.circuit_breaker = circuit_breaker
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_timers = _Timers()
+        self.session = requests.Session()
+        # pool_connections is the number of hosts kept pooled, pool_maxsize the keep-alive connections per host.
+        adapter_class = _HedgingAdapter if hedge is not None else HTTPAdapter
+        adapter = adapter_class(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+        retry = Retry(max_attempts=max(1, max_retries),
+                      delay=retry_delay,
+                      backoff=retry_backoff,
+                      exceptions=(RequestException,),
+                      is_retryable=_is_retryable)
+        fetch, open_stream = self._fetch, self._open_stream
+        if circuit_breaker is not None:
+            # 4xx responses are the caller's fault and must not open the circuit on a healthy upstream:
+            # unless the breaker brings its own predicate, only connection errors, timeouts and 5xx count.
+            is_failure = circuit_breaker.is_failure or is_dependency_failure
+            # Each attempt passes through the breaker; once it opens, CircuitOpenError skips the remaining retries.
+            fetch = circuit_breaker.guard(fetch, is_failure)
+            open_stream = circuit_breaker.guard(open_stream, is_failure)
+        self._fetch_with_retry = retry(fetch)
+        self._open_with_retry = retry(open_stream)
 
-    @Retry(max_attempts=3, delay=1, backoff=2)
-    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        url = f"{self.base_url}{endpoint}"
-        Logger.client(f"Making GET request to {url} with params: {params}")
-        
+    def _fetch(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if self.hedge is not None and method in HedgePolicy.IDEMPOTENT_METHODS:
+            return self._fetch_hedged(method, url, **kwargs)
+        return self._attempt(method, url, **kwargs)
+
+    def _fetch_hedged(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Sends the request on the caller's thread and, if it is still outstanding
+        after the hedge delay, a backup attempt on the hedge pool; the first
+        successful response wins. The winner aborts the connections of the other
+        attempts, so a slow primary does not hold the caller once a backup has
+        answered.
+        """
+        policy = self.hedge
+        policy.begin()
+        start = time.monotonic()
+        call = _HedgedCall()
+        self._hedge_timers.call_later(policy.hedge_delay(),
+                                      lambda: self._launch_backup(call, method, url, kwargs, start))
+        try:
+            response = self._run_attempt(call.primary, method, url, kwargs)
+        except RequestException as e:
+            with call.lock:
+                call.primary_done = True
+                if call.response is None and call.running == 0:
+                    call.finished = True
+                    raise
+                call.error = call.error or e
+            call.done.wait()
+        else:
+            with call.lock:
+                call.primary_done = call.finished = True
+                if call.response is None:
+                    call.response = response
+                    call.done.set()
+                else:
+                    response.close()
+                losers = list(call.backups)
+            for slot in losers:
+                slot.abort()
+        if call.response is None:
+            raise call.error
+        policy.record(time.monotonic() - start, call.backup_won)
+        return call.response
+
+    def _launch_backup(self, call: _HedgedCall, method: str, url: str, kwargs: Dict[str, Any],
+                       start: float) -> None:
+        policy = self.hedge
+        with call.lock:
+            if call.finished or call.primary_done or call.hedges >= policy.max_hedges or not policy.try_hedge():
+                return
+            call.hedges += 1
+            call.running += 1
+            slot = _AttemptSlot()
+            call.backups.append(slot)
+        Logger.client("Hedging %s request to %s after %.3fs", method, url, time.monotonic() - start)
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=policy.max_workers,
+                                                      thread_name_prefix='HttpClientHedge')
+        self._hedge_executor.submit(self._run_backup, call, slot, method, url, kwargs)
+        if call.hedges < policy.max_hedges:
+            self._hedge_timers.call_later(policy.hedge_delay(),
+                                          lambda: self._launch_backup(call, method, url, kwargs, start))
+
+    def _run_backup(self, call: _HedgedCall, slot: _AttemptSlot, method: str, url: str,
+                    kwargs: Dict[str, Any]) -> None:
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self._run_attempt(slot, method, url, kwargs)
+        except BaseException as e:
+            with call.lock:
+                call.running -= 1
+                call.error = call.error or e
+                if call.primary_done and call.running == 0:
+                    call.finished = True
+                    call.done.set()
+            return
+        with call.lock:
+            call.running -= 1
+            if call.response is not None:
+                response.close()
+                return
+            call.response, call.backup_won, call.finished = response, True, True
+            losers = [call.primary] + [other for other in call.backups if other is not slot]
+            call.done.set()
+        for other in losers:
+            other.abort()
+
+    def _run_attempt(self, slot: _AttemptSlot, method: str, url: str, kwargs: Dict[str, Any]) -> requests.Response:
+        _current_slot.slot = slot
+        try:
+            return self._attempt(method, url, **kwargs)
+        finally:
+            _current_slot.slot = None
+
+    def _attempt(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
             response.raise_for_status()
-            Logger.client(f"Response from {url}: {response.text}")
-            return response.json()  # Assuming JSON response
+            Logger.client(lambda: f"Response from {url}: {_preview(response.content, self.log_body_limit)}")
+            return response
         except RequestException as e:
-            Logger.error(f"GET request failed: {e}")
+            slot = getattr(_current_slot, 'slot', None)
+            if slot is not None and slot.aborted:
+                Logger.debug("Abandoned hedged %s attempt to %s", method, url)
+            else:
+                Logger.error("%s request failed: %s", method, e)
             raise
 
-    @Retry(max_attempts=3, delay=1, backoff=2)
-    def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
-        url = f"{self.base_url}{endpoint}"
-        Logger.client(f"Making POST request to {url} with data: {data}")
-        
+    def _cached_get(self, url: str, **kwargs: Any) -> Any:
+        cache = self.response_cache
+        key = cache.key(url, kwargs.get('params'))
+        entry = cache.lookup(key)
+        if entry is not None:
+            if cache.is_fresh(entry):
+                Logger.client("Serving cached response for %s", key)
+                return json.loads(entry['body'])
+            kwargs['headers'] = {**cache.conditional_headers(entry), **(kwargs.get('headers') or {})}
+        response = self._fetch_with_retry('GET', url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            Logger.client("Revalidated cached response for %s", key)
+            cache.refresh(key, entry, response)
+            return json.loads(entry['body'])
+        cache.store_response(key, response)
+        return response.json()  # Assuming JSON response
+
+    def _open_stream(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, stream=True, **kwargs)
+        except RequestException as e:
+            Logger.error("%s request failed: %s", method, e)
+            raise
         try:
-            response = requests.post(url, json=data, timeout=self.timeout)
             response.raise_for_status()
-            Logger.client(f"Response from {url}: {response.text}")
-            return response.json()  # Assuming JSON response
         except RequestException as e:
-            Logger.error(f"POST request failed: {e}")
+            response.close()
+            Logger.error("%s request failed: %s", method, e)
             raise
+        Logger.client("Streaming response from %s (status %s, length %s)",
+                      url, response.status_code, response.headers.get('Content-Length', 'unknown'))
+        return response
+
+    def request(self, method: str, endpoint: str, **kwargs: Any) -> Any:
+        url = f"{self.base_url}{endpoint}"
+        if method == 'GET' and self.response_cache is not None:
+            return self._cached_get(url, **kwargs)
+        return self._fetch_with_retry(method, url, **kwargs).json()  # Assuming JSON response
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making GET request to %s%s with params: %s", self.base_url, endpoint, params)
+        return self.request('GET', endpoint, params=params)
+
+    def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making POST request to %s%s with data: %s", self.base_url, endpoint, data)
+        return self.request('POST', endpoint, json=data)
+
+    def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making PUT request to %s%s with data: %s", self.base_url, endpoint, data)
+        return self.request('PUT', endpoint, json=data)
+
+    def patch(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making PATCH request to %s%s with data: %s", self.base_url, endpoint, data)
+        return self.request('PATCH', endpoint, json=data)
+
+    def delete(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making DELETE request to %s%s with params: %s", self.base_url, endpoint, params)
+        return self.request('DELETE', endpoint, params=params)
+
+    @contextmanager
+    def stream(self, method: str, endpoint: str, **kwargs: Any) -> Iterator[requests.Response]:
+        """Opens a streamed response whose body is read on demand; the connection is released on exit."""
+        url = f"{self.base_url}{endpoint}"
+        Logger.client("Making streamed %s request to %s", method, url)
+        response = self._open_with_retry(method, url, **kwargs)
+        try:
+            yield response
+        finally:
+            response.close()
+
+    def stream_lines(self,
+                     endpoint: str,
+                     params: Optional[Dict[str, Any]] = None,
+                     method: str = 'GET',
+                     chunk_size: int = 64 * 1024,
+                     **kwargs: Any) -> Iterator[str]:
+        with self.stream(method, endpoint, params=params, **kwargs) as response:
+            yield from iter_lines(response.iter_content(chunk_size), response.encoding or 'utf-8')
+
+    def stream_ndjson(self,
+                      endpoint: str,
+                      params: Optional[Dict[str, Any]] = None,
+                      method: str = 'GET',
+                      chunk_size: int = 64 * 1024,
+                      **kwargs: Any) -> Iterator[Any]:
+        for line in self.stream_lines(endpoint, params, method, chunk_size, **kwargs):
+            if line.strip():
+                yield json.loads(line)
+
+    def stream_json_array(self,
+                          endpoint: str,
+                          params: Optional[Dict[str, Any]] = None,
+                          method: str = 'GET',
+                          chunk_size: int = 64 * 1024,
+                          **kwargs: Any) -> Iterator[Any]:
+        with self.stream(method, endpoint, params=params, **kwargs) as response:
+            yield from iter_json_array(response.iter_content(chunk_size), response.encoding or 'utf-8')
+
+    def download_to(self,
+                    endpoint: str,
+                    file_path: str,
+                    params: Optional[Dict[str, Any]] = None,
+                    chunk_size: int = 64 * 1024) -> int:
+        """Streams a response body to a file in fixed-size chunks and returns the number of bytes written."""
+        written = 0
+        with self.stream('GET', endpoint, params=params) as response, open(file_path, 'wb') as file:
+            for chunk in response.iter_content(chunk_size):
+                file.write(chunk)
+                written += len(chunk)
+        Logger.client("Downloaded %d bytes from %s%s to %s", written, self.base_url, endpoint, file_path)
+        return written
+
+    def close(self) -> None:
+        self._hedge_timers.close()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+            self._hedge_executor = None
+        self.session.close()
+
+    def __enter__(self) -> 'HttpClient':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+
+class AsyncHttpClient:
+    def __init__(self,
+                 base_url: str,
+                 timeout: float = 5.0,
+                 max_retries: int = 3,
+                 retry_delay: float = 1.0,
+                 retry_backoff: float = 2.0,
+                 max_concurrency: int = 100,
+                 pool_size: int = 100,
+                 pool_size_per_host: int = 0,
+                 headers: Optional[Dict[str, str]] = None,
+                 log_body_limit: Optional[int] = 1024):
+        import aiohttp
+        self._aiohttp = aiohttp
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.retry_backoff = retry_backoff
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.headers = headers
+        self.log_body_limit = log_body_limit
+        self._session = None
+        # Bounds in-flight requests per client, independently of the connection pool size.
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        retry = Retry(max_attempts=max(1, max_retries),
+                      delay=retry_delay,
+                      backoff=retry_backoff,
+                      exceptions=(aiohttp.ClientError, asyncio.TimeoutError))
+        self._send_with_retry = retry(self._send)
+
+    def _get_session(self) -> Any:
+        if self._session is None or self._session.closed:
+            connector = self._aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size_per_host)
+            self._session = self._aiohttp.ClientSession(connector=connector,
+                                                        headers=self.headers,
+                                                        timeout=self._aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> Any:
+        session = self._get_session()
+        try:
+            async with self._semaphore:
+                async with session.request(method, url, **kwargs) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+        except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+            Logger.error("%s request failed: %s", method, e)
+            raise
+        Logger.client(lambda: f"Response from {url}: {_preview(body, self.log_body_limit)}")
+        return json.loads(body)  # Assuming JSON response
+
+    async def request(self, method: str, endpoint: str, **kwargs: Any) -> Any:
+        return await self._send_with_retry(method, f"{self.base_url}{endpoint}", **kwargs)
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making GET request to %s%s with params: %s", self.base_url, endpoint, params)
+        return await self.request('GET', endpoint, params=params)
+
+    async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making POST request to %s%s with data: %s", self.base_url, endpoint, data)
+        return await self.request('POST', endpoint, json=data)
+
+    async def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making PUT request to %s%s with data: %s", self.base_url, endpoint, data)
+        return await self.request('PUT', endpoint, json=data)
+
+    async def patch(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making PATCH request to %s%s with data: %s", self.base_url, endpoint, data)
+        return await self.request('PATCH', endpoint, json=data)
+
+    async def delete(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        Logger.client("Making DELETE request to %s%s with params: %s", self.base_url, endpoint, params)
+        return await self.request('DELETE', endpoint, params=params)
+
+    async def gather_many(self, calls: Iterable[Sequence[Any]], concurrency: Optional[int] = None) -> List[Any]:
+        """
+        Runs many requests with bounded fan-out and returns results in input order.
+
+        Each call is `(method, endpoint)` or `(method, endpoint, kwargs)`. A failed
+        call leaves its exception in the result list instead of aborting the rest.
+        Only `concurrency` worker coroutines exist at once, however many calls there are.
+        """
+        calls = list(calls)
+        results: List[Any] = [None] * len(calls)
+        pending = iter(enumerate(calls))
+
+        async def worker() -> None:
+            for index, call in pending:
+                method, endpoint = call[0], call[1]
+                kwargs = call[2] if len(call) > 2 else {}
+                try:
+                    results[index] = await self.request(method, endpoint, **kwargs)
+                except Exception as e:
+                    results[index] = e
+
+        workers = min(concurrency or self.max_concurrency, len(calls))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> 'AsyncHttpClient':
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        await self.close()
@@ -9,9 +9,9 @@ class TaskManager:
         def decorator(func):
             @self.celery.task(name=task_name)
             def wrapper(*args, **kwargs):
-                Logger.info(f"Starting task '{task_name}' with args: {args} and kwargs: {kwargs}")
+                Logger.info("Starting task '%s' with args: %s and kwargs: %s", task_name, args, kwargs)
                 result = func(*args, **kwargs)
-                Logger.info(f"Task '{task_name}' completed with result: {result}")
+                Logger.info("Task '%s' completed with result: %s", task_name, result)
                 return result
             return wrapper
         return decorator
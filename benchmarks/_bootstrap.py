@@ -0,0 +1,41 @@
+"""
+Shared setup for the benchmark scripts in this directory.
+
+Importing it makes this checkout importable as `pyutils` (the modules import
+each other by that name) and keeps the logger quiet unless a benchmark turns
+it up itself.
+"""
+import importlib.machinery
+import importlib.util
+import os
+import resource
+import sys
+import time
+from typing import Any, Callable, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if 'pyutils' not in sys.modules:
+    _spec = importlib.machinery.ModuleSpec('pyutils', None, is_package=True)
+    _package = importlib.util.module_from_spec(_spec)
+    _package.__path__ = [ROOT]
+    sys.modules['pyutils'] = _package
+
+from pyutils.logger.logger import Logger  # noqa: E402
+
+Logger.set_level('WARNING')
+
+
+def best_of(func: Callable[[], Any], repeat: int = 5) -> Tuple[float, Any]:
+    """Runs `func` `repeat` times and returns the fastest wall time in seconds and the last result."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (Linux reports KiB, macOS bytes)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
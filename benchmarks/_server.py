@@ -0,0 +1,41 @@
+"""Local keep-alive HTTP server for the client benchmarks."""
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is visible
+    # Headers and body leave in one write; separate small writes hit Nagle plus delayed ACK (~40 ms).
+    wbufsize = 65536
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        settings = self.server.settings
+        if settings['stall'] and random.random() < settings['stall_rate']:
+            settings['stall_event'].wait(settings['stall'])
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start(stall: float = 0.0, stall_rate: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Starts a server on an ephemeral port and returns it with its base URL.
+
+    A `stall_rate` fraction of responses is delayed by `stall` seconds. Call
+    `server.shutdown()` when done.
+    """
+    ThreadingHTTPServer.request_queue_size = 256
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.settings = {'stall': stall, 'stall_rate': stall_rate, 'stall_event': threading.Event()}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,79 @@
+"""
+Rows/s and peak RSS of CsvFileHandler's reading modes on a generated 5-column CSV.
+
+Each mode runs in its own subprocess so its peak RSS is measured on its own.
+The typed modes use the schema id:int, score:float, active:bool.
+
+    python benchmarks/bench_csv.py [--rows 1000000] [--modes read,iter_rows,...]
+"""
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import _bootstrap  # noqa: F401
+from _bootstrap import peak_rss_mb
+from pyutils.filehandler.filehandler import CsvFileHandler
+
+SCHEMA = {'id': int, 'score': float, 'active': bool}
+MODES = ('read', 'iter_rows', 'iter_chunks', 'read_columns', 'read_columns_numpy', 'iter_column_chunks')
+
+
+def generate(path: str, rows: int) -> None:
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'name', 'score', 'active', 'city'])
+        for i in range(rows):
+            writer.writerow([i, f"user{i}", i * 0.25, i % 3 == 0, 'Amsterdam' if i % 2 else 'Berlin'])
+
+
+def run_mode(mode: str, path: str) -> int:
+    """Reads the whole file in one mode and returns the number of rows seen."""
+    handler = CsvFileHandler()
+    if mode == 'read':
+        return len(handler.read(path))
+    if mode == 'iter_rows':
+        return sum(1 for _ in handler.iter_rows(path))
+    if mode == 'iter_chunks':
+        return sum(len(chunk) for chunk in handler.iter_chunks(path, 10_000))
+    if mode in ('read_columns', 'read_columns_numpy'):
+        return len(handler.read_columns(path, SCHEMA, use_numpy=mode == 'read_columns_numpy')['id'])
+    if mode == 'iter_column_chunks':
+        return sum(len(chunk['id']) for chunk in handler.iter_column_chunks(path, SCHEMA))
+    raise ValueError(f"Unknown mode: {mode}")
+
+
+def child(mode: str, path: str) -> None:
+    started = time.perf_counter()
+    rows = run_mode(mode, path)
+    elapsed = time.perf_counter() - started
+    print(rows, elapsed, peak_rss_mb())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--modes', default=','.join(MODES), help="comma-separated subset of: " + ', '.join(MODES))
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'data.csv')
+        generate(path, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(path) / (1 << 20):.0f} MiB")
+        print(f"{'mode':<22}{'rows/s':>12}{'seconds':>10}{'peak RSS MiB':>14}")
+        for mode in args.modes.split(','):
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, path],
+                                    check=True, capture_output=True, text=True).stdout.split()
+            rows, elapsed, peak = int(output[0]), float(output[1]), float(output[2])
+            print(f"{mode:<22}{rows / elapsed:>12,.0f}{elapsed:>10.2f}{peak:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
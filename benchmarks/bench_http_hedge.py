@@ -0,0 +1,51 @@
+"""
+Tail latency of sequential GETs with and without hedged requests, against a server where some responses stall.
+
+    python benchmarks/bench_http_hedge.py [--requests 600] [--stall-ms 300] [--stall-rate 0.05]
+"""
+import argparse
+import random
+import time
+
+import _bootstrap  # noqa: F401
+import _server
+from pyutils.apiclient.client import HedgePolicy, HttpClient
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(base_url: str, requests: int, hedge):
+    random.seed(1)  # the same stalls for both runs
+    latencies = []
+    with HttpClient(base_url, hedge=hedge, pool_maxsize=32) as client:
+        for i in range(requests):
+            started = time.perf_counter()
+            client.get(f"/items/{i}")
+            latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--stall-ms', type=float, default=300)
+    parser.add_argument('--stall-rate', type=float, default=0.05)
+    args = parser.parse_args()
+    server, base_url = _server.start(stall=args.stall_ms / 1000, stall_rate=args.stall_rate)
+    try:
+        plain = run(base_url, args.requests, None)
+        policy = HedgePolicy()
+        hedged = run(base_url, args.requests, policy)
+    finally:
+        server.shutdown()
+    print(f"{args.requests} sequential GETs, {args.stall_rate:.0%} of responses stall {args.stall_ms:.0f} ms")
+    print(f"{'client':<12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'extra requests':>16}")
+    for name, latencies, extra in (('plain', plain, 0), ('hedged', hedged, policy.stats()['hedges'])):
+        print(f"{name:<12}{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 95) * 1000:>9.1f}"
+              f"{percentile(latencies, 99) * 1000:>9.1f}{extra / args.requests:>16.1%}")
+
+
+if __name__ == '__main__':
+    main()
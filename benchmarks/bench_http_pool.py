@@ -0,0 +1,41 @@
+"""
+Sequential GETs through module-level requests.get against HttpClient's pooled keep-alive session.
+
+    python benchmarks/bench_http_pool.py [--requests 2000]
+"""
+import argparse
+import time
+
+import requests
+
+import _bootstrap  # noqa: F401
+import _server
+from pyutils.apiclient.client import HttpClient
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+    server, base_url = _server.start()
+    try:
+        started = time.perf_counter()
+        for i in range(args.requests):
+            requests.get(f"{base_url}/items/{i}", timeout=5).json()
+        unpooled = args.requests / (time.perf_counter() - started)
+
+        with HttpClient(base_url) as client:
+            started = time.perf_counter()
+            for i in range(args.requests):
+                client.get(f"/items/{i}")
+            pooled = args.requests / (time.perf_counter() - started)
+    finally:
+        server.shutdown()
+    print(f"{args.requests} sequential GETs against a local HTTP/1.1 server")
+    print(f"{'client':<28}{'req/s':>10}")
+    print(f"{'requests.get (new conn)':<28}{unpooled:>10,.0f}")
+    print(f"{'HttpClient (pooled)':<28}{pooled:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+KeyedRateLimiter against one RateLimiter per key in a dict: memory per key and multi-threaded acquires/s.
+
+Memory is traced with tracemalloc after the key strings already exist, so it
+counts only the limiter state.
+
+    python benchmarks/bench_keyed_limiter.py [--keys 1000000] [--threads 8] [--ops 200000]
+"""
+import argparse
+import random
+import threading
+import time
+import tracemalloc
+
+import _bootstrap  # noqa: F401
+from pyutils.ratelimiter.limiter import KeyedRateLimiter, RateLimiter
+
+RATE, PER = 100.0, 1.0
+
+
+class DictOfLimiters:
+    """The straightforward alternative: a RateLimiter created on first use of each key."""
+
+    def __init__(self):
+        self.limiters = {}
+
+    def try_acquire(self, key: str) -> bool:
+        limiter = self.limiters.get(key)
+        if limiter is None:
+            limiter = self.limiters.setdefault(key, RateLimiter(RATE, PER))
+        return limiter.try_acquire()
+
+
+def memory_per_key(factory, keys) -> float:
+    tracemalloc.start()
+    limiter = factory()
+    before = tracemalloc.get_traced_memory()[0]
+    for key in keys:
+        limiter.try_acquire(key)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(keys)
+
+
+def throughput(factory, keys, threads: int, ops: int) -> float:
+    limiter = factory()
+    for key in keys:
+        limiter.try_acquire(key)
+    batches = [[random.choice(keys) for _ in range(ops)] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(batch):
+        barrier.wait()
+        for key in batch:
+            limiter.try_acquire(key)
+
+    workers = [threading.Thread(target=worker, args=(batch,)) for batch in batches]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * ops / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--keys', type=int, default=1_000_000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=200_000, help="try_acquire calls per thread")
+    args = parser.parse_args()
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.keys)]
+    candidates = (('KeyedRateLimiter', lambda: KeyedRateLimiter(RATE, PER, idle_after=3600)),
+                  ('dict of RateLimiter', DictOfLimiters))
+    print(f"{args.keys} keys, {args.threads} threads x {args.ops} try_acquire")
+    print(f"{'':<22}{'bytes/key':>10}{'acquires/s':>14}")
+    for name, factory in candidates:
+        per_key = memory_per_key(factory, keys)
+        rate = throughput(factory, keys, args.threads, args.ops)
+        print(f"{name:<22}{per_key:>10.0f}{rate:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+JsonLinesFileSink throughput with size-based rotation, synchronous and through the queued writer.
+
+    python benchmarks/bench_log_sink.py [--records 500000] [--max-bytes 8388608]
+"""
+import argparse
+import os
+import shutil
+import struct
+import tempfile
+import time
+
+import _bootstrap  # noqa: F401
+from pyutils.logger.logger import JsonLinesFileSink, Logger
+
+
+def run(directory: str, records: int, max_bytes: int, queued: bool) -> float:
+    path = os.path.join(directory, 'app.log')
+    sink = JsonLinesFileSink(path, max_bytes=max_bytes)
+    Logger.set_sinks([sink])
+    if queued:
+        Logger.enable_async()
+    started = time.perf_counter()
+    for i in range(records):
+        Logger.info("request %d served", i, extra={'user': i % 1000, 'path': '/api/items'})
+    if queued:
+        Logger.disable_async()
+    sink.close()  # waits for background compression of rotated segments
+    elapsed = time.perf_counter() - started
+    written, rotated = 0, 0
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), 'rb') as file:
+            if name.endswith('.gz'):
+                # The gzip trailer ends with the uncompressed size (mod 2**32).
+                file.seek(-4, os.SEEK_END)
+                written += struct.unpack('<I', file.read(4))[0]
+                rotated += 1
+            else:
+                written += os.fstat(file.fileno()).st_size
+    return written / elapsed / 1e6, rotated, records / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=500_000)
+    parser.add_argument('--max-bytes', type=int, default=8 << 20)
+    args = parser.parse_args()
+    Logger.set_level('INFO')
+    sinks = Logger.sinks
+    print(f"{args.records} records with two extra fields, rotation at {args.max_bytes} bytes")
+    print(f"{'mode':<14}{'MB/s':>8}{'records/s':>12}{'segments':>10}")
+    try:
+        for queued in (False, True):
+            directory = tempfile.mkdtemp(prefix='bench-log-')
+            try:
+                mb_per_s, segments, rate = run(directory, args.records, args.max_bytes, queued)
+            finally:
+                shutil.rmtree(directory)
+            print(f"{'queued' if queued else 'synchronous':<14}{mb_per_s:>8.1f}{rate:>12,.0f}{segments:>10}")
+    finally:
+        Logger.set_sinks(sinks)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Logger throughput: the synchronous print path against the queued background writer.
+
+Console output goes to /dev/null so the terminal is not what is measured.
+
+    python benchmarks/bench_logger_async.py [--records 200000]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+import _bootstrap  # noqa: F401
+from pyutils.logger.logger import Logger
+
+
+def run(records: int) -> float:
+    started = time.perf_counter()
+    for i in range(records):
+        Logger.info("benchmark record %d", i)
+    return records / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=200_000)
+    args = parser.parse_args()
+    Logger.set_level('INFO')
+    report = sys.stdout
+    rows = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        rows.append(('synchronous print', run(args.records), 0))
+        for overflow in ('block', 'drop_oldest', 'drop'):
+            writer = Logger.enable_async(overflow=overflow)
+            rate = run(args.records)
+            Logger.flush()
+            rows.append((f"queued, overflow={overflow}", rate, writer.dropped))
+            Logger.disable_async()
+    print(f"{args.records} Logger.info calls, stdout to /dev/null", file=report)
+    print(f"{'mode':<28}{'calls/s':>12}{'dropped':>10}", file=report)
+    for mode, rate, dropped in rows:
+        print(f"{mode:<28}{rate:>12,.0f}{dropped:>10}", file=report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+BaseFileHandler.read_many on threads and processes against sequential reads.
+
+Two workloads in a temporary directory: many small JSON files, and a few large
+gzip-compressed JSON Lines files written with JsonLinesFileHandler.write.
+
+    python benchmarks/bench_read_many.py [--small-files 1000] [--large-files 4] [--records 300000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import _bootstrap  # noqa: F401
+from _bootstrap import best_of
+from pyutils.filehandler.filehandler import JsonFileHandler, JsonLinesFileHandler
+
+
+def plain_loop(paths):
+    results = []
+    for path in paths:
+        with open(path) as file:
+            results.append(json.load(file))
+    return results
+
+
+def report(label: str, seconds: float) -> None:
+    print(f"  {label:<30}{seconds:>8.3f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--small-files', type=int, default=1000)
+    parser.add_argument('--large-files', type=int, default=4)
+    parser.add_argument('--records', type=int, default=300_000, help="records per large file")
+    args = parser.parse_args()
+    print(f"{os.cpu_count()} CPU(s)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_handler = JsonFileHandler()
+        small = [os.path.join(directory, f"small{i}.json") for i in range(args.small_files)]
+        started = time.perf_counter()
+        for i, path in enumerate(small):
+            json_handler.write(path, {'id': i, 'name': f"item{i}", 'values': list(range(20))})
+        print(f"{args.small_files} small JSON files (atomic write of all: {time.perf_counter() - started:.2f} s)")
+        report('plain open + json.load loop', best_of(lambda: plain_loop(small))[0])
+        report('handler.read loop', best_of(lambda: [json_handler.read(p) for p in small])[0])
+        report('read_many, threads', best_of(lambda: json_handler.read_many(small))[0])
+        report('read_many, processes', best_of(lambda: json_handler.read_many(small, use_processes=True))[0])
+
+        lines_handler = JsonLinesFileHandler()
+        large = [os.path.join(directory, f"large{i}.jsonl.gz") for i in range(args.large_files)]
+        for path in large:
+            lines_handler.write(path, ({'id': i, 'user': f"user{i}", 'score': i * 0.5, 'tags': ['a', 'b']}
+                                       for i in range(args.records)))
+        size = os.path.getsize(large[0]) / (1 << 20) if large else 0
+        print(f"{args.large_files} x {args.records}-record .jsonl.gz ({size:.1f} MiB each)")
+        report('read loop', best_of(lambda: [lines_handler.read(p) for p in large], repeat=1)[0])
+        report('read_many, threads', best_of(lambda: lines_handler.read_many(large), repeat=1)[0])
+        report('read_many, processes', best_of(lambda: lines_handler.read_many(large, use_processes=True), repeat=1)[0])
+
+
+if __name__ == '__main__':
+    main()
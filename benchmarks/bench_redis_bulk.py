@@ -0,0 +1,80 @@
+"""
+RedisCache one-key-at-a-time calls against set_many/get_many, on fakeredis.
+
+Every round trip to the server is counted, and `--latency-ms` adds a fixed
+delay to each one to model a network hop.
+
+    python benchmarks/bench_redis_bulk.py [--keys 1000] [--latency-ms 0] [--codec json]
+"""
+import argparse
+import time
+
+import _bootstrap  # noqa: F401
+from pyutils.cachingutils.caching import RedisCache
+
+
+class CountingRedis:
+    """Wraps a client and counts (and optionally delays) every round trip, pipelines included."""
+
+    def __init__(self, client, latency: float):
+        self._client = client
+        self.latency = latency
+        self.round_trips = 0
+
+    def _trip(self) -> None:
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def execute_command(self, *args, **kwargs):
+        self._trip()
+        return self._client.execute_command(*args, **kwargs)
+
+    def pipeline(self, *args, **kwargs):
+        pipe = self._client.pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        def counted_execute(*a, **k):
+            self._trip()
+            return execute(*a, **k)
+        pipe.execute = counted_execute
+        return pipe
+
+    def __getattr__(self, name):
+        # Commands such as get/set/mget route through execute_command on the wrapper.
+        attribute = getattr(type(self._client), name)
+        if callable(attribute):
+            return lambda *args, **kwargs: attribute(self, *args, **kwargs)
+        return getattr(self._client, name)
+
+
+def main() -> None:
+    import fakeredis
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--keys', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--codec', default='json')
+    args = parser.parse_args()
+    mapping = {f"user:{i}": {'id': i, 'name': f"user {i}", 'roles': ['read', 'write']} for i in range(args.keys)}
+    keys = list(mapping)
+    print(f"{args.keys} keys, codec={args.codec}, {args.latency_ms} ms per round trip")
+    print(f"{'mode':<26}{'time ms':>10}{'round trips':>13}")
+    for mode in ('set/get one by one', 'set_many/get_many'):
+        client = CountingRedis(fakeredis.FakeRedis(), args.latency_ms / 1000)
+        cache = RedisCache(client=client, codec=args.codec)
+        started = time.perf_counter()
+        if mode == 'set_many/get_many':
+            cache.set_many(mapping)
+            result = cache.get_many(keys)
+        else:
+            for key, value in mapping.items():
+                cache.set(key, value)
+            result = {key: cache.get(key) for key in keys}
+        elapsed = time.perf_counter() - started
+        assert result == mapping
+        print(f"{mode:<26}{elapsed * 1000:>10.1f}{client.round_trips:>13}")
+
+
+if __name__ == '__main__':
+    main()
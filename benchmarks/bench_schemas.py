@@ -0,0 +1,65 @@
+"""
+Encode/decode time of compiled record schemas against generic dataclass handling.
+
+Generic means dataclasses.asdict + json.dumps(default=str) and json.loads + Rec(**d),
+which neither validates nor converts fields back. Compiled means JsonSerializer
+after register_schema(Rec), decoding with loads(..., cls=Rec).
+
+    python benchmarks/bench_schemas.py [--records 10000]
+"""
+import argparse
+import dataclasses
+import datetime as dt
+import json
+from decimal import Decimal
+from typing import List, Optional
+
+import _bootstrap  # noqa: F401
+from _bootstrap import best_of
+from pyutils.serliazerserializer.serialize import JsonSerializer, register_schema
+
+
+@dataclasses.dataclass
+class Rec:
+    id: int
+    name: str
+    email: str
+    score: float
+    active: bool
+    created: dt.datetime
+    balance: Decimal
+    tags: List[str] = dataclasses.field(default_factory=list)
+    note: Optional[str] = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=10_000)
+    args = parser.parse_args()
+    start = dt.datetime(2024, 1, 1)
+    records = [Rec(i, f"user{i}", f"user{i}@example.com", i * 1.5, i % 2 == 0, start + dt.timedelta(seconds=i),
+                   Decimal(i) / 100, ['a', 'b']) for i in range(args.records)]
+
+    def row(label: str, encode, decode) -> None:
+        encode_time, encoded = best_of(encode)
+        decode_time, _ = best_of(lambda: decode(encoded))
+        print(f"{label:<44}{encode_time * 1e3:>10.1f}{decode_time * 1e3:>10.1f}")
+
+    print(f"{args.records} records; best of 5")
+    print(f"{'':<44}{'enc ms':>10}{'dec ms':>10}")
+    row('asdict + json.dumps / Rec(**d), unchecked',
+        lambda: json.dumps([dataclasses.asdict(r) for r in records], default=str),
+        lambda s: [Rec(**d) for d in json.loads(s)])
+    register_schema(Rec)
+    for backend in ('json', 'orjson'):
+        try:
+            serializer = JsonSerializer(backend=backend)
+        except ImportError:
+            print(f"compiled, {backend:<30}skipped: not installed")
+            continue
+        row(f"compiled, {backend}, validated", lambda: serializer.dumps(records),
+            lambda s: serializer.loads(s, cls=Rec))
+
+
+if __name__ == '__main__':
+    main()
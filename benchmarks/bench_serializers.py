@@ -0,0 +1,55 @@
+"""
+Payload size and encode/decode time of JsonSerializer (stdlib and orjson backends) and BinarySerializer (msgpack).
+
+Backends that are not installed are skipped.
+
+    python benchmarks/bench_serializers.py [--records 100]
+"""
+import argparse
+import datetime as dt
+
+import _bootstrap  # noqa: F401
+from _bootstrap import best_of
+from pyutils.serliazerserializer.serialize import BinarySerializer, JsonSerializer
+
+
+def candidates():
+    yield 'json (stdlib)', lambda: JsonSerializer(backend='json')
+    yield 'json (orjson)', lambda: JsonSerializer(backend='orjson')
+    yield 'msgpack', BinarySerializer
+
+
+def measure(serializer, payload):
+    encoded = serializer.dumps(payload)
+    number = 2000 // len(payload) if isinstance(payload, list) else 2000
+    encode, _ = best_of(lambda: [serializer.dumps(payload) for _ in range(number)], repeat=7)
+    decode, _ = best_of(lambda: [serializer.loads(encoded) for _ in range(number)], repeat=7)
+    return len(encoded), encode / number * 1e6, decode / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=100)
+    args = parser.parse_args()
+    start = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    with_datetime = [{'id': i, 'user': f"user{i}", 'score': i * 0.5, 'active': i % 2 == 0,
+                      'tags': ['a', 'b'], 'created': start + dt.timedelta(seconds=i)} for i in range(args.records)]
+    with_int_ts = [dict(record, created=int(record['created'].timestamp())) for record in with_datetime]
+    small = {'id': 1, 'user': 'alice', 'active': True}
+    payloads = ((f"{args.records} records, datetime", with_datetime),
+                (f"{args.records} records, int ts", with_int_ts),
+                ('small dict', small))
+    print(f"{'payload':<28}{'serializer':<16}{'bytes':>8}{'encode us':>11}{'decode us':>11}")
+    for name, factory in candidates():
+        try:
+            serializer = factory()
+        except ImportError as e:
+            print(f"{'':<28}{name:<16}skipped: {e}")
+            continue
+        for label, payload in payloads:
+            size, encode, decode = measure(serializer, payload)
+            print(f"{label:<28}{name:<16}{size:>8}{encode:>11.1f}{decode:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
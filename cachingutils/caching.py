@@ -1,31 +1,1128 @@
-from functools import lru_cache
-from typing import Callable, Any, Dict
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import types
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Any, Dict, Hashable, List, Optional, Set, Tuple
 from pyutils.logger.logger import Logger
 
 
+_MISSING = object()
+# Result of an async flight whose leader was cancelled: one waiting caller takes the call over.
+_ABANDONED = object()
+_SCALARS = (str, int, float, bool, bytes, type(None))
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turns lists, dicts and sets into tagged hashable equivalents so they can be part of a key."""
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return ('dict', frozenset((_freeze(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return ('set', frozenset(_freeze(item) for item in value))
+    return value
+
+
+def make_key(args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """Builds a hashable cache key from call arguments, raising TypeError if one cannot be hashed."""
+    key = (tuple(_freeze(arg) for arg in args),
+           tuple(sorted((name, _freeze(value)) for name, value in kwargs.items())))
+    hash(key)
+    return key
+
+
+def _fingerprint_code(code: types.CodeType, digest: Any) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode('utf-8'))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _fingerprint_code(const, digest)
+        else:
+            digest.update(repr(const).encode('utf-8'))
+
+
+def code_version(func: Callable) -> str:
+    """Hashes a function's bytecode, constants and referenced names, including nested functions."""
+    code = getattr(inspect.unwrap(func), '__code__', None)
+    if code is None:
+        return ''
+    digest = hashlib.blake2b(digest_size=8)
+    _fingerprint_code(code, digest)
+    return digest.hexdigest()
+
+
+def _canonical(value: Any, out: List[bytes]) -> None:
+    """
+    Serializes a key deterministically across processes; set members are ordered by their encoding.
+
+    Raises TypeError for any type outside None, bool, int, float, str, bytes,
+    tuple and frozenset.
+    """
+    if value is None or isinstance(value, bool):
+        out.append(b'N' if value is None else (b'T' if value else b'F'))
+    elif isinstance(value, int):
+        out.append(b'i%d;' % value)
+    elif isinstance(value, float):
+        out.append(b'f' + repr(value).encode('ascii') + b';')
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        out.append(b's%d:' % len(data) + data)
+    elif isinstance(value, bytes):
+        out.append(b'b%d:' % len(value) + value)
+    elif isinstance(value, tuple):
+        out.append(b'(')
+        for item in value:
+            _canonical(item, out)
+        out.append(b')')
+    elif isinstance(value, frozenset):
+        members = []
+        for item in value:
+            encoded: List[bytes] = []
+            _canonical(item, encoded)
+            members.append(b''.join(encoded))
+        out.append(b'{' + b''.join(sorted(members)) + b'}')
+    else:
+        # repr() is not a key: distinct values can share one (elided NumPy arrays, custom
+        # __repr__) and default reprs embed a memory address that never matches again.
+        raise TypeError(f"No deterministic key encoding for {type(value).__name__} values.")
+
+
+def stable_digest(key: Hashable) -> bytes:
+    """Digest of a key that is identical across processes and interpreter runs; TypeError if it has none."""
+    out: List[bytes] = []
+    _canonical(key, out)
+    return hashlib.blake2b(b''.join(out), digest_size=16).digest()
+
+
+class EvictionPolicy(ABC):
+    """Tracks key usage inside one shard and chooses which key to evict."""
+
+    @abstractmethod
+    def on_insert(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def on_access(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def on_remove(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def victim(self) -> Hashable:
+        pass
+
+    def on_miss(self, key: Hashable) -> None:
+        pass
+
+    def admit(self, candidate: Hashable, victim: Hashable) -> bool:
+        return True
+
+
+class LRUPolicy(EvictionPolicy):
+    """Least recently used, O(1) via an ordered dict."""
+
+    def __init__(self, capacity: Optional[int] = None):
+        self._order: OrderedDict = OrderedDict()
+
+    def on_insert(self, key: Hashable) -> None:
+        self._order[key] = None
+
+    def on_access(self, key: Hashable) -> None:
+        self._order.move_to_end(key)
+
+    def on_remove(self, key: Hashable) -> None:
+        del self._order[key]
+
+    def victim(self) -> Hashable:
+        return next(iter(self._order))
+
+
+class LFUPolicy(EvictionPolicy):
+    """Least frequently used with LRU tie-breaking, O(1) via frequency buckets."""
+
+    def __init__(self, capacity: Optional[int] = None):
+        self._freq: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min_freq = 0
+
+    def _bucket(self, freq: int) -> OrderedDict:
+        bucket = self._buckets.get(freq)
+        if bucket is None:
+            bucket = self._buckets[freq] = OrderedDict()
+        return bucket
+
+    def _unlink(self, key: Hashable, freq: int) -> None:
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+    def on_insert(self, key: Hashable) -> None:
+        self._freq[key] = 1
+        self._bucket(1)[key] = None
+        self._min_freq = 1
+
+    def on_access(self, key: Hashable) -> None:
+        freq = self._freq[key]
+        self._unlink(key, freq)
+        if self._min_freq == freq and freq not in self._buckets:
+            self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._bucket(freq + 1)[key] = None
+
+    def on_remove(self, key: Hashable) -> None:
+        self._unlink(key, self._freq.pop(key))
+
+    def victim(self) -> Hashable:
+        if self._min_freq not in self._buckets:
+            self._min_freq = min(self._buckets)
+        return next(iter(self._buckets[self._min_freq]))
+
+
+class _FrequencySketch:
+    """Count-min sketch of 4-bit-style saturating counters that halves itself periodically."""
+
+    DEPTH = 4
+    MAX_COUNT = 15
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < capacity * 2:
+            width <<= 1
+        self._mask = width - 1
+        self._tables = [bytearray(width) for _ in range(self.DEPTH)]
+        self._sample_size = max(10 * capacity, 64)
+        self._additions = 0
+
+    def _indexes(self, key: Hashable):
+        h = hash(key)
+        h2 = (h >> 16) | 1
+        return [(h + i * h2) & self._mask for i in range(self.DEPTH)]
+
+    def increment(self, key: Hashable) -> None:
+        for table, index in zip(self._tables, self._indexes(key)):
+            if table[index] < self.MAX_COUNT:
+                table[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._reset()
+
+    def estimate(self, key: Hashable) -> int:
+        return min(table[index] for table, index in zip(self._tables, self._indexes(key)))
+
+    def _reset(self) -> None:
+        self._additions //= 2
+        for table in self._tables:
+            table[:] = bytes(count >> 1 for count in table)
+
+
+class TinyLFUPolicy(LRUPolicy):
+    """LRU eviction behind a TinyLFU admission filter: a new key only displaces a more frequently seen victim."""
+
+    def __init__(self, capacity: Optional[int] = None):
+        super().__init__(capacity)
+        self._sketch = _FrequencySketch(capacity or 1024)
+
+    def on_insert(self, key: Hashable) -> None:
+        super().on_insert(key)
+        self._sketch.increment(key)
+
+    def on_access(self, key: Hashable) -> None:
+        super().on_access(key)
+        self._sketch.increment(key)
+
+    def on_miss(self, key: Hashable) -> None:
+        self._sketch.increment(key)
+
+    def admit(self, candidate: Hashable, victim: Hashable) -> bool:
+        return self._sketch.estimate(candidate) > self._sketch.estimate(victim)
+
+
+EVICTION_POLICIES = {
+    'lru': LRUPolicy,
+    'lfu': LFUPolicy,
+    'tinylfu': TinyLFUPolicy,
+}
+
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'weight')
+
+    def __init__(self, value: Any, expires_at: Optional[float], weight: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.weight = weight
+
+
+class _Shard:
+    def __init__(self, max_size: Optional[int], max_weight: Optional[int], policy: EvictionPolicy):
+        self.max_size = max_size
+        self.max_weight = max_weight
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.data: Dict[Hashable, _Entry] = {}
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+
+    def get(self, key: Hashable, now: float) -> Any:
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None:
+                self.misses += 1
+                self.policy.on_miss(key)
+                return _MISSING
+            if entry.expires_at is not None and entry.expires_at <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                self.policy.on_miss(key)
+                return _MISSING
+            self.hits += 1
+            self.policy.on_access(key)
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float], weight: int) -> bool:
+        with self.lock:
+            if self.max_weight is not None and weight > self.max_weight:
+                if key in self.data:
+                    self._remove(key)
+                self.rejections += 1
+                return False
+            entry = self.data.get(key)
+            if entry is not None:
+                self.weight += weight - entry.weight
+                entry.value, entry.expires_at, entry.weight = value, expires_at, weight
+                self.policy.on_access(key)
+                while self.max_weight is not None and self.weight > self.max_weight:
+                    victim = self.policy.victim()
+                    if victim == key:
+                        break
+                    self._remove(victim)
+                    self.evictions += 1
+                return True
+            admitted = False
+            while self._over_capacity(weight):
+                victim = self.policy.victim()
+                if not admitted:
+                    if not self.policy.admit(key, victim):
+                        self.rejections += 1
+                        return False
+                    admitted = True
+                self._remove(victim)
+                self.evictions += 1
+            self.data[key] = _Entry(value, expires_at, weight)
+            self.weight += weight
+            self.policy.on_insert(key)
+            return True
+
+    def delete(self, key: Hashable) -> bool:
+        with self.lock:
+            if key not in self.data:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        with self.lock:
+            for key in list(self.data):
+                self._remove(key)
+
+    def _over_capacity(self, incoming: int) -> bool:
+        if not self.data:
+            return False
+        if self.max_size is not None and len(self.data) + 1 > self.max_size:
+            return True
+        return self.max_weight is not None and self.weight + incoming > self.max_weight
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self.data.pop(key)
+        self.weight -= entry.weight
+        self.policy.on_remove(key)
+
+
+class BaseStore(ABC):
+    """Key/value storage used behind `Cache`."""
+
+    persistent = False
+
+    @abstractmethod
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> bool:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        pass
+
+
+class MemoryStore(BaseStore):
+    """
+    Bounded in-process store with TTLs, pluggable eviction and per-shard locks.
+
+    Keys are spread over independent shards, each with its own lock, policy and
+    share of the size limits, so concurrent callers rarely contend.
+    """
+
+    def __init__(self,
+                 max_size: Optional[int] = 128,
+                 ttl: Optional[float] = None,
+                 eviction: str = 'lru',
+                 max_weight: Optional[int] = None,
+                 weigher: Optional[Callable[[Any], int]] = None,
+                 shards: Optional[int] = None):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}. Use one of {list(EVICTION_POLICIES)}.")
+        if max_size is None and max_weight is None:
+            raise ValueError("At least one of max_size or max_weight must be set.")
+        if shards is None:
+            shards = max(1, min(16, (max_size or 1024) // 64))
+        self.max_size = max_size
+        self.max_weight = max_weight
+        self.ttl = ttl
+        self.eviction = eviction
+        self.weigher = weigher or (sys.getsizeof if max_weight is not None else None)
+        shard_size = -(-max_size // shards) if max_size is not None else None
+        shard_weight = -(-max_weight // shards) if max_weight is not None else None
+        policy = EVICTION_POLICIES[eviction]
+        self._shards: List[_Shard] = [_Shard(shard_size, shard_weight, policy(shard_size)) for _ in range(shards)]
+
+    def _shard(self, key: Hashable) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._shard(key).get(key, time.monotonic())
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """Stores a value; returns False if it was too heavy or refused admission."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        weight = self.weigher(value) if self.weigher is not None else 1
+        return self._shard(key).set(key, value, expires_at, weight)
+
+    def delete(self, key: Hashable) -> bool:
+        return self._shard(key).delete(key)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.data) for shard in self._shards)
+
+    def stats(self) -> Dict[str, Any]:
+        totals = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'rejections': 0, 'size': 0, 'weight': 0}
+        for shard in self._shards:
+            with shard.lock:
+                totals['hits'] += shard.hits
+                totals['misses'] += shard.misses
+                totals['evictions'] += shard.evictions
+                totals['expirations'] += shard.expirations
+                totals['rejections'] += shard.rejections
+                totals['size'] += len(shard.data)
+                totals['weight'] += shard.weight
+        lookups = totals['hits'] + totals['misses']
+        totals['hit_ratio'] = totals['hits'] / lookups if lookups else 0.0
+        return totals
+
+
 class Cache:
-    def __init__(self, max_size: int = 128):
+    def __init__(self,
+                 max_size: Optional[int] = 128,
+                 ttl: Optional[float] = None,
+                 eviction: str = 'lru',
+                 max_weight: Optional[int] = None,
+                 weigher: Optional[Callable[[Any], int]] = None,
+                 shards: Optional[int] = None,
+                 store: Optional[BaseStore] = None):
         self.max_size = max_size
+        self.ttl = ttl
+        if store is None:
+            store = MemoryStore(max_size, ttl, eviction, max_weight, weigher, shards)
+        self.store: BaseStore = store
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Hashable, asyncio.Future] = {}
+        self._flights_lock = threading.Lock()
+        self._refresh_tasks: Set[asyncio.Task] = set()
 
-    def cached_function(self, func: Callable) -> Callable:
-        @lru_cache(maxsize=self.max_size)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self.store.get(key, default)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        return self.store.set(key, value, ttl)
+
+    def delete(self, key: Hashable) -> bool:
+        return self.store.delete(key)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+    def cached_function(self,
+                        func: Optional[Callable] = None,
+                        *,
+                        ttl: Optional[float] = None,
+                        single_flight: bool = False,
+                        stale_while_revalidate: Optional[float] = None,
+                        version: Optional[str] = None) -> Callable:
+        """
+        Memoizes a function or coroutine function in this cache.
+
+        With `single_flight`, concurrent misses on the same key wait for one
+        in-flight call and share its result or exception. With
+        `stale_while_revalidate`, an entry older than its TTL keeps being served
+        for that many extra seconds while one background call refreshes it.
+        `version` is part of every key; for persistent stores it defaults to a
+        hash of the function's bytecode, so editing the function invalidates
+        entries written by older code.
+        """
+        if func is None:
+            return functools.partial(self.cached_function, ttl=ttl, single_flight=single_flight,
+                                     stale_while_revalidate=stale_while_revalidate, version=version)
+        ttl = self.ttl if ttl is None else ttl
+        if stale_while_revalidate is not None and ttl is None:
+            raise ValueError("stale_while_revalidate requires a ttl.")
+        if version is None and self.store.persistent:
+            version = code_version(func)
+        name = (f"{func.__module__}.{func.__qualname__}", version)
+        wrap = self._wrap_async if inspect.iscoroutinefunction(func) else self._wrap_sync
+        wrapper = wrap(func, name, ttl, single_flight, stale_while_revalidate)
+        wrapper.cache = self
+        return wrapper
+
+    def _make_key(self, name: Tuple[str, Optional[str]], args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+        """Builds the key for a call; TypeError if it is unhashable or, for persistent stores, has no stable digest."""
+        key = (name, make_key(args, kwargs))
+        if self.store.persistent:
+            stable_digest(key)
+        return key
+
+    def _lookup(self, key: Hashable, swr: Optional[float]) -> Tuple[Any, bool]:
+        """Returns the cached value (or _MISSING) and whether it is past its TTL."""
+        cached = self.store.get(key, _MISSING)
+        if cached is _MISSING or swr is None:
+            return cached, False
+        value, fresh_until = cached
+        return value, time.time() >= fresh_until
+
+    def _save(self, key: Hashable, value: Any, ttl: Optional[float], swr: Optional[float]) -> None:
+        if swr is None:
+            self.store.set(key, value, ttl)
+        else:
+            self.store.set(key, (value, time.time() + ttl), ttl + swr)
+
+    def _begin_flight(self, key: Hashable) -> Tuple['_Flight', bool]:
+        """Returns the in-flight call for a key and whether the caller must run it."""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _end_flight(self, key: Hashable, flight: '_Flight') -> None:
+        with self._flights_lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.event.set()
+
+    def _wrap_sync(self, func: Callable, name: str, ttl: Optional[float],
+                   single_flight: bool, swr: Optional[float]) -> Callable:
+        def compute(key: Hashable, args: tuple, kwargs: Dict[str, Any]) -> Any:
             result = func(*args, **kwargs)
-            Logger.info(f"Caching result for function '{func.__name__}' with args: {args}, kwargs: {kwargs}")
+            self._save(key, result, ttl, swr)
+            Logger.debug("Caching result for function '%s' with args: %s, kwargs: %s", func.__name__, args, kwargs)
             return result
+
+        def lead(key: Hashable, flight: _Flight, args: tuple, kwargs: Dict[str, Any]) -> Any:
+            try:
+                flight.result = compute(key, args, kwargs)
+                return flight.result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                self._end_flight(key, flight)
+
+        def refresh(key: Hashable, flight: _Flight, args: tuple, kwargs: Dict[str, Any]) -> None:
+            try:
+                lead(key, flight, args, kwargs)
+            except Exception as e:
+                Logger.error("Background refresh of '%s' failed: %s", func.__name__, e)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                key = self._make_key(name, args, kwargs)
+            except TypeError:
+                Logger.debug("Uncacheable arguments for function '%s'; calling without cache.", func.__name__)
+                return func(*args, **kwargs)
+            result, stale = self._lookup(key, swr)
+            if result is not _MISSING:
+                if stale:
+                    flight, leader = self._begin_flight(key)
+                    if leader:
+                        threading.Thread(target=refresh, args=(key, flight, args, kwargs), daemon=True).start()
+                return result
+            if not single_flight:
+                return compute(key, args, kwargs)
+            flight, leader = self._begin_flight(key)
+            if not leader:
+                flight.event.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            # A flight may have finished between the miss above and claiming the key.
+            result, stale = self._lookup(key, swr)
+            if result is not _MISSING and not stale:
+                flight.result = result
+                self._end_flight(key, flight)
+                return result
+            return lead(key, flight, args, kwargs)
         return wrapper
 
+    def _wrap_async(self, func: Callable, name: str, ttl: Optional[float],
+                    single_flight: bool, swr: Optional[float]) -> Callable:
+        async def compute(key: Hashable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+            result = await func(*args, **kwargs)
+            self._save(key, result, ttl, swr)
+            Logger.debug("Caching result for function '%s' with args: %s, kwargs: %s", func.__name__, args, kwargs)
+            return result
+
+        async def lead(key: Hashable, flight: asyncio.Future, args: tuple, kwargs: Dict[str, Any]) -> Any:
+            try:
+                result = await compute(key, args, kwargs)
+                flight.set_result(result)
+                return result
+            except asyncio.CancelledError:
+                # Only the leader was cancelled; its followers were not. Release the key first so
+                # the follower that wakes up first can claim it and run the call itself.
+                release(key, flight)
+                flight.set_result(_ABANDONED)
+                raise
+            except BaseException as e:
+                flight.set_exception(e)
+                flight.exception()  # Mark as retrieved so an unawaited flight does not warn.
+                raise
+            finally:
+                release(key, flight)
+
+        def release(key: Hashable, flight: asyncio.Future) -> None:
+            with self._flights_lock:
+                if self._async_flights.get(key) is flight:
+                    del self._async_flights[key]
+
+        def begin(key: Hashable) -> Tuple[asyncio.Future, bool]:
+            loop = asyncio.get_running_loop()
+            with self._flights_lock:
+                flight = self._async_flights.get(key)
+                if flight is not None and flight.get_loop() is loop:
+                    return flight, False
+                flight = self._async_flights[key] = loop.create_future()
+                return flight, True
+
+        async def refresh(key: Hashable, flight: asyncio.Future, args: tuple, kwargs: Dict[str, Any]) -> None:
+            try:
+                await lead(key, flight, args, kwargs)
+            except Exception as e:
+                Logger.error("Background refresh of '%s' failed: %s", func.__name__, e)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                key = self._make_key(name, args, kwargs)
+            except TypeError:
+                Logger.debug("Uncacheable arguments for function '%s'; calling without cache.", func.__name__)
+                return await func(*args, **kwargs)
+            result, stale = self._lookup(key, swr)
+            if result is not _MISSING:
+                if stale:
+                    flight, leader = begin(key)
+                    if leader:
+                        task = asyncio.get_running_loop().create_task(refresh(key, flight, args, kwargs))
+                        self._refresh_tasks.add(task)
+                        task.add_done_callback(self._refresh_tasks.discard)
+                return result
+            if not single_flight:
+                return await compute(key, args, kwargs)
+            while True:
+                flight, leader = begin(key)
+                if leader:
+                    return await lead(key, flight, args, kwargs)
+                result = await asyncio.shield(flight)
+                if result is not _ABANDONED:
+                    return result
+        return wrapper
+
+
+class _Flight:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class JsonCodec:
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PickleCodec:
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class MsgpackCodec:
+    def __init__(self):
+        import msgpack
+        self._packb = msgpack.packb
+        self._unpackb = msgpack.unpackb
+
+    def encode(self, value: Any) -> bytes:
+        return self._packb(value, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return self._unpackb(data, raw=False)
+
+
+CODECS = {
+    'json': JsonCodec,
+    'pickle': PickleCodec,
+    'msgpack': MsgpackCodec,
+}
+
+_PLAIN = b'\x00'
+_ZLIB = b'\x01'
+
+
+class DiskStore(BaseStore):
+    """
+    SQLite-backed store that survives restarts and is shared between processes.
+
+    The database runs in WAL mode so readers never block the writer, and each
+    thread (and each forked process) opens its own connection. Keys are stored
+    as stable digests, values through `codec`. Limits on entry count and total
+    value bytes are enforced every `cull_interval` writes by evicting the least
+    recently used rows; access times are refreshed at most once per second per
+    entry to keep reads from turning into writes.
+    """
+
+    persistent = True
+
+    def __init__(self,
+                 path: str,
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None,
+                 codec: Any = 'pickle',
+                 cull_interval: int = 100,
+                 timeout: float = 30.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.codec = CODECS[codec]() if isinstance(codec, str) else codec
+        self.cull_interval = cull_interval
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                     "key BLOB PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                     "expires_at REAL, accessed_at REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._cull()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        digest = stable_digest(key)
+        conn = self._connection()
+        row = conn.execute("SELECT value, expires_at, accessed_at FROM cache WHERE key = ?", (digest,)).fetchone()
+        now = time.time()
+        if row is None:
+            self._count('misses')
+            return default
+        value, expires_at, accessed_at = row
+        if expires_at is not None and expires_at <= now:
+            conn.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (digest, now))
+            self._count('expirations')
+            self._count('misses')
+            return default
+        if now - accessed_at > 1.0:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, digest))
+        self._count('hits')
+        return self.codec.decode(value)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        ttl = self.ttl if ttl is None else ttl
+        data = self.codec.encode(value)
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return False
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (stable_digest(key), data, len(data), now + ttl if ttl is not None else None, now))
+        with self._lock:
+            self._writes += 1
+            cull = self._writes % self.cull_interval == 0
+        if cull:
+            self._cull()
+        return True
+
+    def delete(self, key: Hashable) -> bool:
+        return self._connection().execute("DELETE FROM cache WHERE key = ?", (stable_digest(key),)).rowcount > 0
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache")
+
+    def _cull(self) -> None:
+        """Removes expired rows, then the least recently used rows until the limits hold."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            expired = conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            evicted = 0
+            if self.max_entries is not None or self.max_bytes is not None:
+                count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+                if self.max_entries is not None and count > self.max_entries:
+                    evicted += conn.execute(
+                        "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                        (count - self.max_entries,)).rowcount
+                    count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+                if self.max_bytes is not None and total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    victims = []
+                    for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+                        if excess <= 0:
+                            break
+                        victims.append((key,))
+                        excess -= size
+                    conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+                    evicted += len(victims)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._count('expirations', expired)
+        self._count('evictions', evicted)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        size, weight = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        with self._lock:
+            totals = {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                      'expirations': self.expirations, 'size': size, 'weight': weight}
+        lookups = totals['hits'] + totals['misses']
+        totals['hit_ratio'] = totals['hits'] / lookups if lookups else 0.0
+        return totals
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
 
 class RedisCache:
-    def __init__(self, host: str = 'localhost', port: int = 6379):
-        import redis
-        self.client = redis.Redis(host=host, port=port)
+    _pools: Dict[tuple, Any] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self,
+                 host: str = 'localhost',
+                 port: int = 6379,
+                 db: int = 0,
+                 max_connections: int = 50,
+                 codec: Any = None,
+                 compress_threshold: Optional[int] = None,
+                 compress_level: int = 6,
+                 client: Any = None):
+        """
+        Redis-backed cache sharing one connection pool per server and pool size.
+
+        `codec` is 'json', 'pickle', 'msgpack' or an object with `encode`/`decode`;
+        without one, values go to redis-py unchanged. Encoded values larger than
+        `compress_threshold` bytes are zlib-compressed. `client` replaces the
+        pooled redis client, e.g. with an in-memory stand-in.
+        """
+        if isinstance(codec, str):
+            if codec not in CODECS:
+                raise ValueError(f"Unknown codec: {codec}. Use one of {list(CODECS)}.")
+            codec = CODECS[codec]()
+        if compress_threshold is not None and codec is None:
+            raise ValueError("compress_threshold requires a codec.")
+        self.codec = codec
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        if client is None:
+            import redis
+            client = redis.Redis(connection_pool=RedisCache.shared_pool(host, port, db, max_connections))
+        self.client = client
+
+    @classmethod
+    def shared_pool(cls, host: str = 'localhost', port: int = 6379, db: int = 0, max_connections: int = 50) -> Any:
+        """Returns the process-wide connection pool for these settings, creating it on first use."""
+        key = (host, port, db, max_connections)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                import redis
+                pool = cls._pools[key] = redis.ConnectionPool(host=host, port=port, db=db,
+                                                              max_connections=max_connections)
+            return pool
+
+    def _encode(self, value: Any) -> Any:
+        if self.codec is None:
+            return value
+        data = self.codec.encode(value)
+        if self.compress_threshold is not None and len(data) > self.compress_threshold:
+            return _ZLIB + zlib.compress(data, self.compress_level)
+        return _PLAIN + data
+
+    def _decode(self, data: Any) -> Any:
+        if self.codec is None or data is None:
+            return data
+        if data[:1] == _ZLIB:
+            return self.codec.decode(zlib.decompress(data[1:]))
+        return self.codec.decode(data[1:])
 
     def set(self, key: str, value: Any, expire: int = 3600) -> None:
-        self.client.set(key, value, ex=expire)
-        Logger.info(f"Set cache for key: {key}")
+        self.client.set(key, self._encode(value), ex=expire)
+        Logger.debug("Set cache for key: %s", key)
 
-    def get(self, key: str) -> Any:
+    def get(self, key: str, default: Any = None) -> Any:
         value = self.client.get(key)
-        Logger.info(f"Retrieved cache for key: {key} with value: {value}")
+        Logger.debug("Retrieved cache for key: %s (%s)", key, 'hit' if value is not None else 'miss')
+        if value is None:
+            return default
+        return self._decode(value)
+
+    def delete(self, key: str) -> bool:
+        return bool(self.client.delete(key))
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Fetches several keys in one MGET round trip; missing keys are left out of the result."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget(keys)
+        Logger.debug(lambda: f"Retrieved {sum(v is not None for v in values)} of {len(keys)} cache keys")
+        return {key: self._decode(value) for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, mapping: Dict[str, Any], expire: int = 3600) -> None:
+        """Stores several keys in one pipelined round trip."""
+        if not mapping:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, self._encode(value), ex=expire)
+        pipe.execute()
+        Logger.debug("Set %d cache keys", len(mapping))
+
+    def delete_many(self, keys: List[str]) -> int:
+        """Deletes several keys in one round trip and returns how many existed."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        return self.client.delete(*keys)
+
+
+class TieredCache:
+    """
+    Bounded in-process L1 in front of a `RedisCache` L2.
+
+    Reads go to L1 first and fill it from L2 on a miss; writes go through to
+    both. Every write or delete publishes the affected keys on a Redis pub/sub
+    channel so other processes drop them from their L1. The short L1 TTL bounds
+    staleness if an invalidation message is missed, e.g. during a reconnect.
+    `l2` needs a codec, so every process reads back the values it stored
+    rather than the bytes Redis returns.
+    """
+
+    def __init__(self,
+                 l2: RedisCache,
+                 l1_max_size: int = 10000,
+                 l1_ttl: float = 5.0,
+                 channel: str = 'pyutils:cache:invalidate',
+                 listen: bool = True):
+        if l2.codec is None:
+            raise ValueError("The L2 RedisCache of a TieredCache needs a codec, e.g. codec='pickle'.")
+        self.l1 = MemoryStore(max_size=l1_max_size, ttl=l1_ttl)
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.channel = channel
+        self._source = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._l2_hits = 0
+        self._l2_misses = 0
+        self._pubsub = None
+        self._listener = None
+        if listen:
+            self._pubsub = self.l2.client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{channel: self._on_invalidate})
+            self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def _count_l2(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self._l2_hits += hits
+            self._l2_misses += misses
+
+    def _l1_ttl(self, expire: Optional[float]) -> float:
+        return self.l1_ttl if expire is None else min(self.l1_ttl, expire)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = self.l2.get(key, _MISSING)
+        if value is _MISSING:
+            self._count_l2(0, 1)
+            return default
+        self._count_l2(1, 0)
+        self.l1.set(key, value)
         return value
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        found: Dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            value = self.l1.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            fetched = self.l2.get_many(missing)
+            self._count_l2(len(fetched), len(missing) - len(fetched))
+            for key, value in fetched.items():
+                self.l1.set(key, value)
+            found.update(fetched)
+        return found
+
+    def set(self, key: str, value: Any, expire: int = 3600) -> None:
+        self.l2.set(key, value, expire)
+        self.l1.set(key, value, self._l1_ttl(expire))
+        self._publish([key])
+
+    def set_many(self, mapping: Dict[str, Any], expire: int = 3600) -> None:
+        self.l2.set_many(mapping, expire)
+        for key, value in mapping.items():
+            self.l1.set(key, value, self._l1_ttl(expire))
+        self._publish(list(mapping))
+
+    def delete(self, key: str) -> bool:
+        existed = self.l2.delete(key)
+        self.l1.delete(key)
+        self._publish([key])
+        return existed
+
+    def delete_many(self, keys: List[str]) -> int:
+        keys = list(keys)
+        deleted = self.l2.delete_many(keys)
+        for key in keys:
+            self.l1.delete(key)
+        self._publish(keys)
+        return deleted
+
+    def invalidate_local(self, keys: List[str]) -> None:
+        """Drops keys from this process's L1 only."""
+        for key in keys:
+            self.l1.delete(key)
+
+    def _publish(self, keys: List[str]) -> None:
+        if keys:
+            self.l2.client.publish(self.channel, json.dumps({'source': self._source, 'keys': keys}))
+
+    def _on_invalidate(self, message: Dict[str, Any]) -> None:
+        try:
+            payload = json.loads(message['data'])
+        except (TypeError, ValueError) as e:
+            Logger.error("Ignoring malformed cache invalidation message: %s", e)
+            return
+        if payload.get('source') != self._source:
+            self.invalidate_local(payload.get('keys', ()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tier hit rates: L1 over all lookups, L2 over the lookups that missed L1."""
+        l1 = self.l1.stats()
+        with self._lock:
+            l2_hits, l2_misses = self._l2_hits, self._l2_misses
+        lookups = l1['hits'] + l1['misses']
+        l2_lookups = l2_hits + l2_misses
+        return {
+            'l1': l1,
+            'l1_hits': l1['hits'],
+            'l2_hits': l2_hits,
+            'misses': l2_misses,
+            'l1_hit_rate': l1['hits'] / lookups if lookups else 0.0,
+            'l2_hit_rate': l2_hits / l2_lookups if l2_lookups else 0.0,
+            'hit_rate': (l1['hits'] + l2_hits) / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
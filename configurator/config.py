@@ -1,19 +1,106 @@
 import json
 import os
+import threading
 import yaml
 import toml
 import configparser
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pyutils.logger.logger import Logger
+
+ChangeCallback = Callable[['Config', List[str]], None]
+
+_MISSING = object()
+_TRUE = ('true', '1', 'yes', 'on')
+_FALSE = ('false', '0', 'no', 'off', '')
+
+
+@lru_cache(maxsize=4096)
+def _compile_path(key: str) -> Tuple[str, ...]:
+    """Split a dotted key into its path once; repeated lookups reuse the tuple."""
+    return tuple(key.split('.'))
+
+
+def _deep_merge(base: Dict[str, Any], layer: Dict[str, Any]) -> Dict[str, Any]:
+    """Return `base` updated with a copy of `layer`, merging nested dicts instead of replacing them."""
+    merged = dict(base)
+    for key, value in layer.items():
+        if isinstance(value, dict):
+            merged[key] = _deep_merge(merged[key] if isinstance(merged.get(key), dict) else {}, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _set_path(data: Dict[str, Any], key: str, value: Any) -> None:
+    *parents, leaf = _compile_path(key)
+    for part in parents:
+        child = data.get(part)
+        if not isinstance(child, dict):
+            child = data[part] = {}
+        data = child
+    data[leaf] = value
+
+
+def _flatten(data: Any, prefix: str = '') -> Dict[str, Any]:
+    if not isinstance(data, dict) or (prefix and not data):
+        return {prefix: data}
+    flat: Dict[str, Any] = {}
+    for key, value in data.items():
+        flat.update(_flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+class _Snapshot:
+    """One merged view of all layers plus the lookups resolved against it."""
+
+    __slots__ = ('data', 'cache')
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.cache: Dict[str, Any] = {}
 
 
 class Config:
-    """A class to handle configuration management."""
+    """
+    A class to handle configuration management.
+
+    Values come from layers merged once per change, later layers winning: the
+    config file, then environment variables, then overrides. Readers always see
+    one complete snapshot, which is swapped atomically on reload, so lookups stay
+    plain dictionary reads.
+    """
 
-    def __init__(self, config_file: str = None):
-        """Initialize the Config with a config file path."""
-        self.config_data: Dict[str, Any] = {}
+    def __init__(self, config_file: str = None, env_prefix: Optional[str] = None,
+                 overrides: Optional[Dict[str, Any]] = None, watch: bool = False, poll_interval: float = 1.0):
+        """Initialize the Config with a config file path and optional env prefix, overrides and watcher."""
+        self.config_file: Optional[str] = None
+        self._file_data: Dict[str, Any] = {}
+        self._env_prefix: Optional[str] = None
+        self._overrides: Dict[str, Any] = {}
+        self._snapshot = _Snapshot({})
+        self._lock = threading.Lock()
+        self._callbacks: List[ChangeCallback] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
         if config_file:
             self.load_from_file(config_file)
+        if env_prefix is not None:
+            self.load_from_env(env_prefix)
+        for key, value in (overrides or {}).items():
+            self.set_override(key, value)
+        if watch:
+            self.watch(poll_interval)
+
+    @property
+    def config_data(self) -> Dict[str, Any]:
+        """The merged configuration currently in effect."""
+        return self._snapshot.data
+
+    @config_data.setter
+    def config_data(self, data: Dict[str, Any]) -> None:
+        self._file_data = data or {}
+        self._rebuild()
 
     def load_from_file(self, config_file: str) -> None:
         """Load configuration from a file."""
@@ -28,6 +115,7 @@ class Config:
             self.load_ini(config_file)
         else:
             raise ValueError("Unsupported file type. Use '.json', '.yaml', '.toml', or '.ini'.")
+        self.config_file = config_file
 
     def load_json(self, config_file: str) -> None:
         """Load configuration from a JSON file."""
@@ -50,13 +138,237 @@ class Config:
         self.config_data = {section: dict(config.items(section)) for section in config.sections()}
 
     def get(self, key: str, default: Any = None) -> Any:
-        """Get a configuration value by key, with optional default."""
-        return self.config_data.get(key, default)
+        """
+        Get a configuration value by key or dotted path (e.g. 'db.pool.size'), with optional default.
+
+        A top-level key that itself contains dots is matched first. Paths that
+        resolve are cached until the next reload; misses are not, so looking up
+        arbitrary keys cannot grow the cache.
+        """
+        snapshot = self._snapshot
+        value = snapshot.cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._resolve(snapshot.data, key)
+            if value is _MISSING:
+                return default
+            snapshot.cache[key] = value
+        return value
+
+    @staticmethod
+    def _resolve(data: Dict[str, Any], key: str) -> Any:
+        if key in data:
+            return data[key]
+        value: Any = data
+        for part in _compile_path(key):
+            if not isinstance(value, dict) or part not in value:
+                return _MISSING
+            value = value[part]
+        return value
+
+    def _typed(self, key: str, default: Any, convert: Callable[[Any], Any], type_name: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Config value '{key}' is not a valid {type_name}: {value!r}")
+
+    def get_int(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        """Get a value as an int, converting strings such as environment values."""
+        return self._typed(key, default, lambda value: value if type(value) is int else int(value), 'int')
+
+    def get_float(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        """Get a value as a float."""
+        return self._typed(key, default, float, 'float')
+
+    def get_bool(self, key: str, default: Optional[bool] = None) -> Optional[bool]:
+        """Get a value as a bool; strings 'true/1/yes/on' and 'false/0/no/off' are accepted."""
+        return self._typed(key, default, self._to_bool, 'bool')
+
+    def get_str(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a value as a str."""
+        return self._typed(key, default, str, 'str')
+
+    def get_list(self, key: str, default: Optional[List[Any]] = None, separator: str = ',') -> Optional[List[Any]]:
+        """Get a value as a list; strings are split on `separator`."""
+        return self._typed(key, default, lambda value: self._to_list(value, separator), 'list')
+
+    @staticmethod
+    def _to_bool(value: Any) -> bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return bool(value)
+        text = str(value).strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError(text)
+
+    @staticmethod
+    def _to_list(value: Any, separator: str) -> List[Any]:
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(separator) if item.strip()]
+        if isinstance(value, (list, tuple)):
+            return list(value)
+        raise TypeError(type(value).__name__)
+
+    def load_from_env(self, prefix: Optional[str] = None) -> None:
+        """
+        Load configurations from environment variables.
+
+        Without a prefix every variable is added as a top-level key. With a prefix
+        only matching variables are used, e.g. with 'APP_' the variable
+        APP_DB__POOL__SIZE sets 'db.pool.size'. Environment values are re-read on
+        every reload.
+        """
+        self._env_prefix = prefix or ''
+        self._rebuild()
+
+    def _env_layer(self) -> Dict[str, Any]:
+        prefix = self._env_prefix
+        if prefix is None:
+            return {}
+        if not prefix:
+            return dict(os.environ)
+        layer: Dict[str, Any] = {}
+        for name, value in os.environ.items():
+            if name.startswith(prefix) and len(name) > len(prefix):
+                _set_path(layer, name[len(prefix):].lower().replace('__', '.'), value)
+        return layer
+
+    def set_override(self, key: str, value: Any) -> None:
+        """Set a value by dotted path that takes precedence over the file and the environment."""
+        with self._lock:
+            _set_path(self._overrides, key, value)
+        self._rebuild()
+
+    def clear_overrides(self) -> None:
+        """Remove all overrides."""
+        with self._lock:
+            self._overrides = {}
+        self._rebuild()
+
+    def on_change(self, callback: ChangeCallback) -> ChangeCallback:
+        """
+        Register `callback(config, changed_keys)` to run after a reload changes any value.
+
+        `changed_keys` lists the dotted paths that were added, removed or changed.
+        Returns the callback, so this can be used as a decorator.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+        return callback
+
+    def _rebuild(self) -> None:
+        """Merge all layers into a new snapshot, swap it in and notify callbacks of changed keys."""
+        with self._lock:
+            data = _deep_merge(_deep_merge(self._file_data, self._env_layer()), self._overrides)
+            old = self._snapshot.data
+            if data == old:
+                return
+            self._snapshot = _Snapshot(data)
+            callbacks = list(self._callbacks)
+        if not callbacks:
+            return
+        old_flat, new_flat = _flatten(old), _flatten(data)
+        changed = sorted(key for key in old_flat.keys() | new_flat.keys()
+                         if old_flat.get(key, _MISSING) != new_flat.get(key, _MISSING))
+        for callback in callbacks:
+            try:
+                callback(self, changed)
+            except Exception as e:
+                Logger.error("Config change callback %r failed: %s", callback, e)
+
+    def reload(self) -> bool:
+        """
+        Re-read the config file and the environment and swap in the result.
+
+        A file that fails to load is logged and the previous values are kept.
+        Returns whether the reload succeeded.
+        """
+        try:
+            if self.config_file:
+                self.load_from_file(self.config_file)
+            else:
+                self._rebuild()
+            return True
+        except Exception as e:
+            Logger.error("Failed to reload config file %s: %s", self.config_file, e)
+            return False
+
+    def watch(self, poll_interval: float = 1.0) -> None:
+        """
+        Reload automatically when the config file changes.
+
+        Uses inotify (through the optional inotify_simple package) where available,
+        reloading once a writer closes the file or a new file is renamed over it.
+        Otherwise polls the file's modification time every `poll_interval` seconds
+        and reloads once a change has held still for two polls. A missing or empty
+        file is never loaded. The watcher runs on a daemon thread.
+        """
+        if not self.config_file:
+            raise ValueError("Watching requires a config file; load one with load_from_file first.")
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._stop.clear()
+            try:
+                from inotify_simple import INotify, flags
+            except ImportError:
+                target, args = self._poll, (poll_interval,)
+            else:
+                inotify = INotify()
+                directory = os.path.dirname(os.path.abspath(self.config_file))
+                # Watch the directory so atomic replacements (write, then rename) are seen too. CREATE is
+                # left out on purpose: it fires while a recreated file is still empty, and the writer's
+                # CLOSE_WRITE follows once the content is complete.
+                inotify.add_watch(directory, flags.CLOSE_WRITE | flags.MOVED_TO)
+                target, args = self._watch_inotify, (inotify, poll_interval)
+            self._watcher = threading.Thread(target=target, args=args, name='ConfigWatcher', daemon=True)
+            self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the file watcher, if one is running."""
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            self._stop.set()
+            watcher.join()
+
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        if not stat.st_size:
+            return None  # an empty file is one being (re)created, not a config to load
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _poll(self, poll_interval: float) -> None:
+        signature = self._file_signature()
+        pending = None
+        while not self._stop.wait(poll_interval):
+            current = self._file_signature()
+            if current is None or current == signature:
+                pending = None
+            elif current != pending:
+                pending = current  # changed: wait one more poll so a file still being written is not loaded
+            else:
+                signature, pending = current, None
+                self.reload()
 
-    def load_from_env(self) -> None:
-        """Load configurations from environment variables."""
-        for key, value in os.environ.items():
-            self.config_data[key] = value
+    def _watch_inotify(self, inotify: Any, poll_interval: float) -> None:
+        name = os.path.basename(self.config_file)
+        try:
+            while not self._stop.is_set():
+                events = inotify.read(timeout=int(poll_interval * 1000))
+                if any(event.name == name for event in events) and self._file_signature() is not None:
+                    self.reload()
+        finally:
+            inotify.close()
 
     def __repr__(self) -> str:
         """String representation of the configuration data."""
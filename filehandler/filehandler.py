@@ -1,17 +1,159 @@
+import bz2
 import csv
+import gzip
+import io
+import itertools
 import json
+import lzma
+import math
+import mmap
 import os
+import struct
+import threading
+import time
 import xml.etree.ElementTree as ET
+import zlib
 import yaml
 import toml
-from typing import Any, Dict, List, Union
-from pyutils.logger.log import Logger
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from pyutils.logger.logger import Logger
+from pyutils.serliazerserializer.serialize import XmlWriter, dict_to_xml, iter_xml, xml_to_dict
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends and index builds run without advisory file locks
+    fcntl = None
 
 
 class FileHandlingError(Exception):
     pass
 
 
+_CODECS = {'gzip': gzip, 'bz2': bz2, 'xz': lzma}
+_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+_MAGIC = ((b'\x1f\x8b', 'gzip'), (b'BZh', 'bz2'), (b'\xfd7zXZ\x00', 'xz'))
+_WRITE_BUFFER = 1 << 20
+# Errors a (possibly compressed) read can raise besides the parser's own.
+_READ_ERRORS = (IOError, EOFError, lzma.LZMAError)
+
+
+def _codec_from_extension(file_path: str, compression: Optional[str]) -> Optional[str]:
+    if compression != 'auto':
+        if compression is not None and compression not in _CODECS:
+            raise ValueError(f"Unsupported compression: {compression!r}. Use 'auto', None, {', '.join(_CODECS)}.")
+        return compression
+    return _EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+def _codec_from_magic(head: bytes) -> Optional[str]:
+    for magic, codec in _MAGIC:
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """Returns 'gzip', 'bz2', 'xz' or None for `file_path`, by extension and then by magic bytes."""
+    codec = _codec_from_extension(file_path, 'auto')
+    if codec is None:
+        with open(file_path, 'rb') as file:
+            codec = _codec_from_magic(file.read(6))
+    return codec
+
+
+@contextmanager
+def open_file(file_path: str, mode: str = 'r', compression: Optional[str] = 'auto',
+              encoding: Optional[str] = None, newline: Optional[str] = None) -> Iterator[IO]:
+    """
+    Opens `file_path` for reading ('r' or 'rb'), decompressing gzip, bz2 and xz transparently.
+
+    With `compression='auto'` the codec comes from the extension, or else from the
+    file's magic bytes, which are peeked from the same open file.
+    """
+    raw = open(file_path, 'rb')
+    stream: IO = raw
+    try:
+        codec = _codec_from_extension(file_path, compression)
+        if codec is None and compression == 'auto':
+            codec = _codec_from_magic(raw.peek(6)[:6])
+        if codec is not None:
+            stream = _CODECS[codec].open(raw, 'rb' if 'b' in mode else 'rt', encoding=encoding, newline=newline)
+        elif 'b' not in mode:
+            stream = io.TextIOWrapper(raw, encoding=encoding, newline=newline)
+        yield stream
+    finally:
+        stream.close()
+        raw.close()
+
+
+@contextmanager
+def atomic_write(file_path: str, mode: str = 'w', compression: Optional[str] = 'auto',
+                 encoding: Optional[str] = None, newline: Optional[str] = None,
+                 fsync: bool = False) -> Iterator[IO]:
+    """
+    Opens a buffered temporary file next to `file_path` and renames it over `file_path` on success.
+
+    Readers see either the old or the new file, never a partial one, and a failed
+    write leaves the old file untouched. The codec is taken from the extension
+    when `compression` is 'auto'. An existing file's permissions are kept.
+    `fsync=True` also makes the new contents durable before the rename.
+    """
+    codec = _codec_from_extension(file_path, compression)
+    directory, name = os.path.split(os.path.abspath(file_path))
+    temp_path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+    raw = open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666),
+               'wb', buffering=_WRITE_BUFFER)
+    stream: IO = raw
+    try:
+        if codec is not None:
+            stream = _CODECS[codec].open(raw, 'wb' if 'b' in mode else 'wt', encoding=encoding, newline=newline)
+        elif 'b' not in mode:
+            stream = io.TextIOWrapper(raw, encoding=encoding, newline=newline)
+        yield stream
+        if codec is not None:
+            stream.close()  # writes the compressed trailer; leaves `raw` open
+        else:
+            stream.flush()
+        raw.flush()
+        if fsync:
+            os.fsync(raw.fileno())
+        stream.close()
+        raw.close()
+        try:
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, file_path)
+    except BaseException:
+        for handle in (stream, raw):
+            try:
+                handle.close()
+            except Exception:
+                pass
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _read_path(handler: 'BaseFileHandler', file_path: str, return_exceptions: bool) -> Any:
+    try:
+        return handler.read(file_path)
+    except FileHandlingError as e:
+        if return_exceptions:
+            return e
+        raise
+
+
+def _read_path_in_process(handler_class: type, file_path: str, return_exceptions: bool) -> Any:
+    return _read_path(handler_class(), file_path, return_exceptions)
+
+
 class BaseFileHandler:
     def read(self, file_path: str) -> Any:
         pass
@@ -19,6 +161,36 @@ class BaseFileHandler:
     def write(self, file_path: str, data: Any) -> None:
         pass
 
+    def read_many(self, file_paths: Iterable[str], workers: Optional[int] = None, use_processes: bool = False,
+                  return_exceptions: bool = False) -> List[Any]:
+        """
+        Reads many files concurrently and returns their contents in the order of `file_paths`.
+
+        At most `workers` reads run at once, on threads by default. Use processes
+        for CPU-bound parsing of large files; each worker process reads with a
+        fresh instance of this handler's class. With `return_exceptions` a file
+        that fails yields its FileHandlingError in place of its data instead of
+        failing the whole call.
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return []
+        started = time.perf_counter()
+        if use_processes:
+            workers = min(workers or os.cpu_count() or 1, len(file_paths))
+            chunksize = max(1, len(file_paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_read_path_in_process, itertools.repeat(type(self)), file_paths,
+                                            itertools.repeat(return_exceptions), chunksize=chunksize))
+        else:
+            workers = min(workers or min(32, (os.cpu_count() or 1) + 4), len(file_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_read_path, itertools.repeat(self), file_paths,
+                                            itertools.repeat(return_exceptions)))
+        Logger.info("Read %d files with %d %s in %.2f seconds", len(file_paths), workers,
+                    'processes' if use_processes else 'threads', time.perf_counter() - started)
+        return results
+
 
 class JsonFileHandler(BaseFileHandler):
     def read(self, file_path: str) -> Dict[str, Any]:
@@ -27,17 +199,17 @@ class JsonFileHandler(BaseFileHandler):
             raise FileHandlingError(f"File not found: {file_path}")
         
         try:
-            with open(file_path, 'r') as file:
+            with open_file(file_path) as file:
                 data = json.load(file)
                 Logger.info(f"Successfully read JSON file: {file_path}")
                 return data
-        except (json.JSONDecodeError, IOError) as e:
+        except (json.JSONDecodeError, *_READ_ERRORS) as e:
             Logger.error(f"Failed to read JSON file: {e}")
             raise FileHandlingError(f"Failed to read JSON file: {e}")
 
     def write(self, file_path: str, data: Dict[str, Any]) -> None:
         try:
-            with open(file_path, 'w') as file:
+            with atomic_write(file_path) as file:
                 json.dump(data, file, indent=4)
                 Logger.info(f"Successfully wrote JSON file: {file_path}")
         except IOError as e:
@@ -45,29 +217,381 @@ class JsonFileHandler(BaseFileHandler):
             raise FileHandlingError(f"Failed to write JSON file: {e}")
 
 
+# Bumped whenever the indexing rules change, so older sidecars are rebuilt.
+_INDEX_MAGIC = b'JSONLID2'
+# Sidecar index header: magic, number of data-file bytes covered, CRC32 of the first block of the data file.
+_INDEX_HEADER = struct.Struct('<8sQI')
+_FINGERPRINT_BYTES = 65536
+# Bytes that bytes.strip() removes: a line made only of these is blank and is not a record.
+_WHITESPACE = frozenset(b' \t\n\r\x0b\x0c')
+
+
+def _fingerprint(file: IO[bytes], size: int) -> int:
+    file.seek(0)
+    return zlib.crc32(file.read(min(size, _FINGERPRINT_BYTES)))
+
+
+@contextmanager
+def _file_lock(file: IO, exclusive: bool) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def _scan_offsets(file: IO[bytes], start: int, end: int, offsets: array) -> None:
+    """Appends the start offset of every non-blank line in [start, end) to `offsets` in one mmap pass."""
+    if end <= start:
+        return
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        find = mapped.find
+        position = start
+        while position < end:
+            newline = find(b'\n', position, end)
+            stop = end if newline == -1 else newline
+            # Same blank-line rule as _parse_lines and iter_records; only lines that start with whitespace pay for strip().
+            if stop > position and (mapped[position] not in _WHITESPACE or mapped[position:stop].strip()):
+                offsets.append(position)
+            position = stop + 1
+
+
+def _parse_lines(data: bytes) -> List[Any]:
+    return [json.loads(line) for line in data.split(b'\n') if line.strip()]
+
+
+def _read_jsonl_range(file_path: str, start: int, end: int, func: Optional[Callable[[Any], Any]]) -> List[Any]:
+    # Runs in worker processes: reads only its own byte range.
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        records = _parse_lines(file.read(end - start))
+    return [func(record) for record in records] if func is not None else records
+
+
+class _LineIndex:
+    def __init__(self, file_path: str, offsets: array, size: int):
+        self.file_path = file_path
+        self.offsets = offsets
+        self.size = size
+        self._map: Optional[mmap.mmap] = None
+
+    def end(self, index: int) -> int:
+        return self.offsets[index + 1] if index + 1 < len(self.offsets) else self.size
+
+    def read(self, start: int, end: int) -> bytes:
+        if self._map is None or len(self._map) < end:
+            self.close()
+            with open(self.file_path, 'rb') as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[start:end]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class JsonLinesFileHandler(BaseFileHandler):
+    """
+    JSON Lines files with random access through a persisted line-offset index.
+
+    The index is built with one mmap scan and kept next to the data file as
+    `<file>.idx`. It is reused while it matches the data file and extended by
+    scanning only the new tail when the file has grown, so `get`, slices and
+    `iter_parallel` never reread records they do not return.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, _LineIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def index_path(file_path: str) -> str:
+        return f"{file_path}.idx"
+
+    @staticmethod
+    def _encode(record: Any) -> bytes:
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+    def read(self, file_path: str) -> List[Any]:
+        return list(self.iter_records(file_path))
+
+    def iter_records(self, file_path: str) -> Iterator[Any]:
+        if not os.path.exists(file_path):
+            Logger.error("File not found: %s", file_path)
+            raise FileHandlingError(f"File not found: {file_path}")
+
+        try:
+            with open_file(file_path, 'rb') as file:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+        except (json.JSONDecodeError, *_READ_ERRORS) as e:
+            Logger.error("Failed to read JSON Lines file: %s", e)
+            raise FileHandlingError(f"Failed to read JSON Lines file: {e}")
+
+    def write(self, file_path: str, data: Iterable[Any]) -> None:
+        """Replaces the file with `data` atomically (temporary file, then rename) and drops its index."""
+        try:
+            with atomic_write(file_path, 'wb') as file:
+                for record in data:
+                    file.write(self._encode(record))
+        except (TypeError, ValueError, IOError) as e:
+            Logger.error("Failed to write JSON Lines file: %s", e)
+            raise FileHandlingError(f"Failed to write JSON Lines file: {e}")
+        with self._lock:
+            self._forget(file_path)
+            if os.path.exists(self.index_path(file_path)):
+                os.unlink(self.index_path(file_path))
+        Logger.info("Successfully wrote JSON Lines file: %s", file_path)
+
+    def append(self, file_path: str, records: Iterable[Any]) -> int:
+        """
+        Appends records with a single O_APPEND write under an exclusive lock and indexes them.
+
+        Concurrent appenders never interleave partial lines. If the process dies
+        before the index is updated, the next load notices and indexes the tail.
+        """
+        try:
+            lines = [self._encode(record) for record in records]
+        except (TypeError, ValueError) as e:
+            Logger.error("Failed to encode JSON Lines records: %s", e)
+            raise FileHandlingError(f"Failed to encode JSON Lines records: {e}")
+        if not lines:
+            return 0
+        if os.path.exists(file_path):
+            self._require_uncompressed(file_path)
+        try:
+            with open(file_path, 'a+b', buffering=0) as file, _file_lock(file, exclusive=True):
+                start = os.fstat(file.fileno()).st_size
+                prefix = b'\n' if start and os.pread(file.fileno(), 1, start - 1) != b'\n' else b''
+                payload = memoryview(prefix + b''.join(lines))
+                while payload:
+                    payload = payload[os.write(file.fileno(), payload):]
+                offsets = array('Q')
+                position = start + len(prefix)
+                for line in lines:
+                    offsets.append(position)
+                    position += len(line)
+                self._extend_index(file_path, file, start, position, offsets)
+        except IOError as e:
+            Logger.error("Failed to append to JSON Lines file: %s", e)
+            raise FileHandlingError(f"Failed to append to JSON Lines file: {e}")
+        Logger.debug("Appended %d records to %s", len(lines), file_path)
+        return len(lines)
+
+    def _extend_index(self, file_path: str, file: IO[bytes], start: int, size: int, offsets: array) -> None:
+        index_path = self.index_path(file_path)
+        try:
+            with open(index_path, 'r+b') as index_file:
+                magic, indexed, _ = _INDEX_HEADER.unpack(index_file.read(_INDEX_HEADER.size))
+                if magic == _INDEX_MAGIC and indexed == start:
+                    # Offsets first, header last: a crash in between leaves the old, still valid header.
+                    index_file.seek(0, os.SEEK_END)
+                    index_file.write(offsets.tobytes())
+                    index_file.seek(0)
+                    index_file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, size, _fingerprint(file, size)))
+        except (OSError, struct.error):
+            pass  # no usable sidecar yet; the next load builds it
+        with self._lock:
+            cached = self._indexes.get(os.path.abspath(file_path))
+            if cached is not None and cached.size == start:
+                cached.offsets.extend(offsets)
+                cached.size = size
+
+    def _load_index(self, file_path: str) -> _LineIndex:
+        index_path = self.index_path(file_path)
+        with open(file_path, 'rb') as file, _file_lock(file, exclusive=False):
+            size = os.fstat(file.fileno()).st_size
+            offsets = array('Q')
+            indexed = 0
+            try:
+                with open(index_path, 'rb') as index_file:
+                    magic, indexed, fingerprint = _INDEX_HEADER.unpack(index_file.read(_INDEX_HEADER.size))
+                    if magic != _INDEX_MAGIC or indexed > size or fingerprint != _fingerprint(file, indexed):
+                        indexed = 0
+                    else:
+                        data = index_file.read()
+                        offsets.frombytes(data[:len(data) - len(data) % offsets.itemsize])
+                        while offsets and offsets[-1] >= indexed:
+                            offsets.pop()
+            except (OSError, struct.error):
+                indexed = 0
+            if indexed == size:
+                return _LineIndex(file_path, offsets, size)
+            started = time.perf_counter()
+            if indexed == 0:
+                del offsets[:]
+            elif offsets:
+                # The last indexed line may have been unterminated and continued since.
+                indexed = offsets.pop()
+            _scan_offsets(file, indexed, size, offsets)
+            temp_path = f"{index_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as index_file:
+                index_file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, size, _fingerprint(file, size)))
+                index_file.write(offsets.tobytes())
+            os.replace(temp_path, index_path)
+        Logger.info("Indexed %d JSON Lines records of %s in %.2f seconds",
+                    len(offsets), file_path, time.perf_counter() - started)
+        return _LineIndex(file_path, offsets, size)
+
+    def _forget(self, file_path: str) -> None:
+        cached = self._indexes.pop(os.path.abspath(file_path), None)
+        if cached is not None:
+            cached.close()
+
+    @staticmethod
+    def _require_uncompressed(file_path: str) -> None:
+        codec = detect_compression(file_path)
+        if codec is not None:
+            Logger.error("Cannot index or append to %s-compressed file: %s", codec, file_path)
+            raise FileHandlingError(f"Random access and appends need an uncompressed file, got {codec}: {file_path}")
+
+    def _index(self, file_path: str) -> _LineIndex:
+        path = os.path.abspath(file_path)
+        try:
+            size = os.stat(path).st_size
+        except FileNotFoundError:
+            Logger.error("File not found: %s", file_path)
+            raise FileHandlingError(f"File not found: {file_path}")
+        with self._lock:
+            cached = self._indexes.get(path)
+            if cached is None or cached.size != size:
+                self._forget(path)
+                self._require_uncompressed(path)
+                cached = self._indexes[path] = self._load_index(path)
+            return cached
+
+    def build_index(self, file_path: str) -> int:
+        """Loads, validates or (re)builds the sidecar index and returns the number of records."""
+        return len(self._index(file_path).offsets)
+
+    def count(self, file_path: str) -> int:
+        return len(self._index(file_path).offsets)
+
+    def get(self, file_path: str, index: Union[int, slice]) -> Any:
+        """Returns record `index`, or a list of records for a slice, reading only their bytes."""
+        line_index = self._index(file_path)
+        total = len(line_index.offsets)
+        try:
+            if isinstance(index, slice):
+                start, stop, step = index.indices(total)
+                if start >= stop:
+                    return []
+                if step == 1:
+                    return _parse_lines(line_index.read(line_index.offsets[start], line_index.end(stop - 1)))
+                return [json.loads(line_index.read(line_index.offsets[i], line_index.end(i)))
+                        for i in range(start, stop, step)]
+            if index < 0:
+                index += total
+            if not 0 <= index < total:
+                raise IndexError(f"Record {index} out of range for {total} records.")
+            return json.loads(line_index.read(line_index.offsets[index], line_index.end(index)))
+        except json.JSONDecodeError as e:
+            Logger.error("Failed to read JSON Lines record: %s", e)
+            raise FileHandlingError(f"Failed to read JSON Lines record: {e}")
+
+    def iter_parallel(self, file_path: str, func: Optional[Callable[[Any], Any]] = None,
+                      workers: Optional[int] = None, chunk_records: Optional[int] = None) -> Iterator[List[Any]]:
+        """
+        Reads the file in record-aligned chunks across worker processes and yields each chunk in order.
+
+        Each worker reads only its byte range. `func`, if given, must be picklable
+        and is applied to every record in the worker, so only its results travel
+        back to this process.
+        """
+        line_index = self._index(file_path)
+        offsets = line_index.offsets
+        total = len(offsets)
+        if not total:
+            return
+        workers = workers or os.cpu_count() or 1
+        chunk_records = chunk_records or max(1, math.ceil(total / (workers * 4)))
+        starts = [offsets[i] for i in range(0, total, chunk_records)]
+        ends = [line_index.end(min(i + chunk_records, total) - 1) for i in range(0, total, chunk_records)]
+        path = os.path.abspath(file_path)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(_read_jsonl_range, itertools.repeat(path), starts, ends, itertools.repeat(func))
+
+    def read_parallel(self, file_path: str, func: Optional[Callable[[Any], Any]] = None,
+                      workers: Optional[int] = None) -> List[Any]:
+        results: List[Any] = []
+        for chunk in self.iter_parallel(file_path, func, workers):
+            results.extend(chunk)
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            for cached in self._indexes.values():
+                cached.close()
+            self._indexes.clear()
+
+
+def _parse_bool(value: str) -> bool:
+    text = value.strip().lower()
+    if text in ('true', '1', 'yes'):
+        return True
+    if text in ('false', '0', 'no', ''):
+        return False
+    raise ValueError(f"invalid boolean: {value!r}")
+
+
+def _parse_float(value: str) -> float:
+    return float(value) if value.strip() else math.nan
+
+
 class CsvFileHandler(BaseFileHandler):
+    # array typecodes and NumPy dtypes for the typed column mode; str columns stay lists.
+    COLUMN_TYPECODES = {int: 'q', float: 'd', bool: 'b'}
+    NUMPY_DTYPES = {'q': 'int64', 'd': 'float64', 'b': 'bool'}
+
     def read(self, file_path: str) -> List[Dict[str, Any]]:
         if not os.path.exists(file_path):
             Logger.error(f"File not found: {file_path}")
             raise FileHandlingError(f"File not found: {file_path}")
 
         try:
-            with open(file_path, 'r') as file:
+            with open_file(file_path, newline='') as file:
                 reader = csv.DictReader(file)
                 data = [row for row in reader]
                 Logger.info(f"Successfully read CSV file: {file_path}")
                 return data
-        except (csv.Error, IOError) as e:
+        except (csv.Error, *_READ_ERRORS) as e:
             Logger.error(f"Failed to read CSV file: {e}")
             raise FileHandlingError(f"Failed to read CSV file: {e}")
 
+    def iter_rows(self, file_path: str) -> Iterator[Dict[str, str]]:
+        """Yields one dict per row while reading, instead of building the whole list."""
+        if not os.path.exists(file_path):
+            Logger.error("File not found: %s", file_path)
+            raise FileHandlingError(f"File not found: {file_path}")
+
+        try:
+            with open_file(file_path, newline='') as file:
+                yield from csv.DictReader(file)
+        except (csv.Error, *_READ_ERRORS) as e:
+            Logger.error("Failed to read CSV file: %s", e)
+            raise FileHandlingError(f"Failed to read CSV file: {e}")
+
+    def iter_chunks(self, file_path: str, size: int) -> Iterator[List[Dict[str, str]]]:
+        """Yields lists of up to `size` row dicts."""
+        rows = self.iter_rows(file_path)
+        while True:
+            chunk = list(itertools.islice(rows, size))
+            if not chunk:
+                return
+            yield chunk
+
     def write(self, file_path: str, data: List[Dict[str, Any]]) -> None:
         if not data:
             Logger.warning("No data provided to write to CSV.")
             return
 
         try:
-            with open(file_path, 'w', newline='') as file:
+            with atomic_write(file_path, newline='') as file:
                 writer = csv.DictWriter(file, fieldnames=data[0].keys())
                 writer.writeheader()
                 writer.writerows(data)
@@ -76,60 +600,183 @@ class CsvFileHandler(BaseFileHandler):
             Logger.error(f"Failed to write CSV file: {e}")
             raise FileHandlingError(f"Failed to write CSV file: {e}")
 
+    def write_rows(self, file_path: str, rows: Iterable[Dict[str, Any]],
+                   fieldnames: Optional[Sequence[str]] = None) -> int:
+        """
+        Writes rows from any iterable as they are produced and returns how many were written.
+
+        Without `fieldnames` the columns are taken from the first row.
+        """
+        rows = iter(rows)
+        if fieldnames is None:
+            first = next(rows, None)
+            if first is None:
+                Logger.warning("No data provided to write to CSV.")
+                return 0
+            fieldnames = list(first.keys())
+            rows = itertools.chain([first], rows)
+        count = 0
+
+        def counted() -> Iterator[Dict[str, Any]]:
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+
+        try:
+            with atomic_write(file_path, newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(counted())
+            Logger.info("Successfully wrote %d CSV rows to %s", count, file_path)
+            return count
+        except IOError as e:
+            Logger.error("Failed to write CSV file: %s", e)
+            raise FileHandlingError(f"Failed to write CSV file: {e}")
+
+    def _column(self, values: Iterator[str], column_type: type, numpy: Any) -> Any:
+        if column_type is str:
+            return list(values)
+        typecode = self.COLUMN_TYPECODES[column_type]
+        if column_type is int:
+            column = array(typecode, map(int, values))
+        elif column_type is bool:
+            column = array(typecode, map(_parse_bool, values))
+        else:
+            values = list(values)
+            try:
+                column = array(typecode, map(float, values))
+            except ValueError:
+                column = array(typecode, map(_parse_float, values))  # empty cells become NaN
+        if numpy is not None:
+            return numpy.frombuffer(column, dtype=self.NUMPY_DTYPES[typecode])
+        return column
+
+    @staticmethod
+    def _numpy(use_numpy: Optional[bool]) -> Any:
+        if use_numpy is False:
+            return None
+        try:
+            import numpy
+        except ImportError:
+            if use_numpy:
+                raise
+            return None
+        return numpy
+
+    def iter_column_chunks(self, file_path: str, schema: Dict[str, type], chunk_size: int = 65536,
+                           use_numpy: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the `schema` columns of up to `chunk_size` rows at a time, parsed to their types.
+
+        `schema` maps column names to int, float, bool or str; other columns are
+        skipped. Numeric and bool columns are stdlib arrays, or NumPy arrays when
+        NumPy is installed (force with `use_numpy`); str columns are lists. Empty
+        float cells become NaN.
+        """
+        if not schema:
+            raise ValueError("The column schema must name at least one column.")
+        for column_type in schema.values():
+            if column_type is not str and column_type not in self.COLUMN_TYPECODES:
+                raise ValueError(f"Unsupported column type: {column_type!r}. Use int, float, bool or str.")
+        numpy = self._numpy(use_numpy)
+        if not os.path.exists(file_path):
+            Logger.error("File not found: %s", file_path)
+            raise FileHandlingError(f"File not found: {file_path}")
+
+        try:
+            with open_file(file_path, newline='') as file:
+                reader = csv.reader(file)
+                header = next(reader, [])
+                missing = [name for name in schema if name not in header]
+                if missing:
+                    raise FileHandlingError(f"Columns not found in {file_path}: {missing}")
+                columns = [(name, header.index(name), column_type) for name, column_type in schema.items()]
+                while True:
+                    rows = list(itertools.islice(reader, chunk_size))
+                    if not rows:
+                        return
+                    chunk = {}
+                    for name, index, column_type in columns:
+                        try:
+                            chunk[name] = self._column(map(itemgetter(index), rows), column_type, numpy)
+                        except (ValueError, IndexError) as e:
+                            raise FileHandlingError(f"Failed to parse column '{name}' as {column_type.__name__}: {e}")
+                    yield chunk
+        except (csv.Error, *_READ_ERRORS) as e:
+            Logger.error("Failed to read CSV file: %s", e)
+            raise FileHandlingError(f"Failed to read CSV file: {e}")
+
+    def read_columns(self, file_path: str, schema: Dict[str, type],
+                     use_numpy: Optional[bool] = None) -> Dict[str, Any]:
+        """Reads whole typed columns (see `iter_column_chunks`) instead of one dict per row."""
+        numpy = self._numpy(use_numpy)
+        columns: Dict[str, Any] = {name: [] if column_type is str else array(self.COLUMN_TYPECODES[column_type])
+                                   for name, column_type in schema.items()}
+        rows = 0
+        for chunk in self.iter_column_chunks(file_path, schema, use_numpy=False):
+            for name, values in chunk.items():
+                columns[name].extend(values)
+            rows += len(next(iter(chunk.values())))
+        if numpy is not None:
+            for name, column in columns.items():
+                if isinstance(column, array):
+                    columns[name] = numpy.frombuffer(column, dtype=self.NUMPY_DTYPES[column.typecode])
+        Logger.info("Successfully read %d rows of %d typed columns from %s", rows, len(columns), file_path)
+        return columns
+
 
 class XmlFileHandler(BaseFileHandler):
     def read(self, file_path: str) -> Dict[str, Any]:
         if not os.path.exists(file_path):
-            Logger.error(f"File not found: {file_path}")
+            Logger.error("File not found: %s", file_path)
             raise FileHandlingError(f"File not found: {file_path}")
 
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            data = self._xml_to_dict(root)
-            Logger.info(f"Successfully read XML file: {file_path}")
+            with open_file(file_path, 'rb') as file:
+                root = ET.parse(file).getroot()
+            data = xml_to_dict(root)
+            Logger.info("Successfully read XML file: %s", file_path)
             return data
-        except ET.ParseError as e:
-            Logger.error(f"Failed to read XML file: {e}")
+        except (ET.ParseError, *_READ_ERRORS) as e:
+            Logger.error("Failed to read XML file: %s", e)
+            raise FileHandlingError(f"Failed to read XML file: {e}")
+
+    def iter_records(self, file_path: str, path: str) -> Iterator[Any]:
+        """Streams the elements at `path` (e.g. 'items/item') as dicts without loading the whole file."""
+        if not os.path.exists(file_path):
+            Logger.error("File not found: %s", file_path)
+            raise FileHandlingError(f"File not found: {file_path}")
+
+        try:
+            with open_file(file_path, 'rb') as file:
+                yield from iter_xml(file, path)
+        except (ET.ParseError, *_READ_ERRORS) as e:
+            Logger.error("Failed to read XML file: %s", e)
             raise FileHandlingError(f"Failed to read XML file: {e}")
 
     def write(self, file_path: str, data: Dict[str, Any], root_tag: str = 'root') -> None:
         try:
             root = ET.Element(root_tag)
-            self._dict_to_xml(data, root)
-            tree = ET.ElementTree(root)
-            tree.write(file_path)
-            Logger.info(f"Successfully wrote XML file: {file_path}")
+            dict_to_xml(data, root)
+            with atomic_write(file_path, 'wb') as file:
+                ET.ElementTree(root).write(file)
+            Logger.info("Successfully wrote XML file: %s", file_path)
         except Exception as e:
-            Logger.error(f"Failed to write XML file: {e}")
+            Logger.error("Failed to write XML file: %s", e)
             raise FileHandlingError(f"Failed to write XML file: {e}")
 
-    @staticmethod
-    def _dict_to_xml(data: Dict[str, Any], parent: ET.Element) -> None:
-        for key, value in data.items():
-            if isinstance(value, dict):
-                child = ET.SubElement(parent, key)
-                XmlFileHandler._dict_to_xml(value, child)
-            elif isinstance(value, list):
-                for item in value:
-                    item_elem = ET.SubElement(parent, key)
-                    if isinstance(item, dict):
-                        XmlFileHandler._dict_to_xml(item, item_elem)
-                    else:
-                        item_elem.text = str(item)
-            else:
-                child = ET.SubElement(parent, key)
-                child.text = str(value)
-
-    @staticmethod
-    def _xml_to_dict(element: ET.Element) -> Dict[str, Any]:
-        data = {}
-        for child in element:
-            if len(child) > 0:
-                data[child.tag] = XmlFileHandler._xml_to_dict(child)
-            else:
-                data[child.tag] = child.text
-        return data
+    def write_records(self, file_path: str, records: Iterable[Any], root_tag: str = 'root',
+                      item_tag: str = 'item') -> int:
+        """Writes records one at a time as repeated `item_tag` elements and returns how many were written."""
+        try:
+            with atomic_write(file_path, encoding='utf-8') as file, XmlWriter(file, root_tag, item_tag) as writer:
+                count = writer.write_many(records)
+            Logger.info("Successfully wrote %d XML records to %s", count, file_path)
+            return count
+        except Exception as e:
+            Logger.error("Failed to write XML file: %s", e)
+            raise FileHandlingError(f"Failed to write XML file: {e}")
 
 
 class YamlFileHandler(BaseFileHandler):
@@ -139,17 +786,17 @@ class YamlFileHandler(BaseFileHandler):
             raise FileHandlingError(f"File not found: {file_path}")
 
         try:
-            with open(file_path, 'r') as file:
+            with open_file(file_path) as file:
                 data = yaml.safe_load(file)
                 Logger.info(f"Successfully read YAML file: {file_path}")
                 return data
-        except (yaml.YAMLError, IOError) as e:
+        except (yaml.YAMLError, *_READ_ERRORS) as e:
             Logger.error(f"Failed to read YAML file: {e}")
             raise FileHandlingError(f"Failed to read YAML file: {e}")
 
     def write(self, file_path: str, data: Dict[str, Any]) -> None:
         try:
-            with open(file_path, 'w') as file:
+            with atomic_write(file_path) as file:
                 yaml.dump(data, file)
                 Logger.info(f"Successfully wrote YAML file: {file_path}")
         except IOError as e:
@@ -164,17 +811,17 @@ class TomlFileHandler(BaseFileHandler):
             raise FileHandlingError(f"File not found: {file_path}")
 
         try:
-            with open(file_path, 'r') as file:
+            with open_file(file_path) as file:
                 data = toml.load(file)
                 Logger.info(f"Successfully read TOML file: {file_path}")
                 return data
-        except (toml.TomlDecodeError, IOError) as e:
+        except (toml.TomlDecodeError, *_READ_ERRORS) as e:
             Logger.error(f"Failed to read TOML file: {e}")
             raise FileHandlingError(f"Failed to read TOML file: {e}")
 
     def write(self, file_path: str, data: Dict[str, Any]) -> None:
         try:
-            with open(file_path, 'w') as file:
+            with atomic_write(file_path) as file:
                 toml.dump(data, file)
                 Logger.info(f"Successfully wrote TOML file: {file_path}")
         except IOError as e:
@@ -1,6 +1,30 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+import traceback
 from abc import ABC, abstractmethod
+from collections import deque
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, TextIO, Union
+
+
+Message = Union[str, Callable[[], str]]
+
+
+class LogRecord(NamedTuple):
+    """Compact log record captured on the calling thread."""
+
+    time_ns: int
+    level: str
+    message: str
+    module: str = ''
+    extra: Optional[Dict[str, Any]] = None
 
 
 class BaseLogger(ABC):
@@ -8,35 +32,321 @@ class BaseLogger(ABC):
 
     @staticmethod
     @abstractmethod
-    def log(level: str, message: str) -> None:
+    def log(level: str, message: Message, *args: Any) -> None:
         """Abstract method to log a message at a specific log level."""
         pass
 
     @staticmethod
     @abstractmethod
-    def error(msg: str) -> None:
+    def error(msg: Message, *args: Any) -> None:
         """Abstract method to log error messages."""
         pass
 
     @staticmethod
     @abstractmethod
-    def client(msg: str) -> None:
+    def warning(msg: Message, *args: Any) -> None:
+        """Abstract method to log warning messages."""
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def client(msg: Message, *args: Any) -> None:
         """Abstract method to log client-related messages."""
         pass
 
     @staticmethod
     @abstractmethod
-    def debug(msg: str) -> None:
+    def debug(msg: Message, *args: Any) -> None:
         """Abstract method to log debug messages."""
         pass
 
     @staticmethod
     @abstractmethod
-    def info(msg: str) -> None:
+    def info(msg: Message, *args: Any) -> None:
         """Abstract method to log informational messages."""
         pass
 
 
+class AsyncLogWriter:
+    """Bounded record queue drained in batches by a background thread."""
+
+    OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop')
+
+    def __init__(self,
+                 write: Callable[[List[LogRecord]], None],
+                 max_size: int = 10000,
+                 overflow: str = 'block',
+                 batch_size: int = 512):
+        """
+        Starts the writer thread.
+
+        Args:
+            write (Callable): Receives each batch of records on the writer thread.
+            max_size (int): Maximum number of records waiting to be written.
+            overflow (str): What to do when the queue is full: 'block' the caller,
+                'drop_oldest' to make room, or 'drop' the new record.
+            batch_size (int): Maximum number of records handed to `write` at once.
+        """
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}. Use one of {self.OVERFLOW_POLICIES}.")
+        if max_size < 1 or batch_size < 1:
+            raise ValueError("max_size and batch_size must be positive.")
+        self.max_size = max_size
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._write = write
+        self._records: deque = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='AsyncLogWriter', daemon=True)
+        self._thread.start()
+
+    def put(self, record: LogRecord) -> None:
+        """Queues a record, applying the overflow policy when the queue is full."""
+        with self._lock:
+            if not self._closed:
+                if len(self._records) >= self.max_size:
+                    if self.overflow == 'drop':
+                        self.dropped += 1
+                        return
+                    if self.overflow == 'drop_oldest':
+                        self._records.popleft()
+                        self.dropped += 1
+                    else:
+                        while len(self._records) >= self.max_size and not self._closed:
+                            self._not_full.wait()
+                if not self._closed:
+                    self._records.append(record)
+                    if len(self._records) == 1:
+                        self._not_empty.notify()
+                    return
+        # The writer is gone; never lose a record that arrives during shutdown.
+        self._write([record])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every queued record has been written. Returns False on timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._records and not self._busy, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Drains the queue and stops the writer thread."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join(timeout)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._records and not self._closed:
+                    self._not_empty.wait()
+                if not self._records:
+                    self._idle.notify_all()
+                    return
+                count = min(len(self._records), self.batch_size)
+                batch = [self._records.popleft() for _ in range(count)]
+                self._busy = True
+                self._not_full.notify_all()
+            try:
+                self._write(batch)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+            finally:
+                with self._lock:
+                    self._busy = False
+                    if not self._records:
+                        self._idle.notify_all()
+
+
+class BaseSink(ABC):
+    """Abstract destination for batches of log records."""
+
+    @abstractmethod
+    def emit(self, records: List[LogRecord]) -> None:
+        """Writes a batch of records."""
+        pass
+
+    def flush(self) -> None:
+        """Flushes any buffered output."""
+        pass
+
+    def close(self) -> None:
+        """Flushes and releases the sink's resources."""
+        pass
+
+
+class ConsoleSink(BaseSink):
+    """Writes human-readable lines, by default to the current `sys.stdout`."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def emit(self, records: List[LogRecord]) -> None:
+        stream = self.stream or sys.stdout
+        stream.write(''.join(Logger._format(record) + '\n' for record in records))
+
+    def flush(self) -> None:
+        (self.stream or sys.stdout).flush()
+
+
+class _CompressionWorker:
+    """Gzips rotated log segments on a background thread."""
+
+    def __init__(self, compresslevel: int = 6):
+        self.compresslevel = compresslevel
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, on_done: Optional[Callable[[], None]] = None) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='LogCompression', daemon=True)
+                self._thread.start()
+        self._jobs.put((path, on_done))
+
+    def close(self) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._jobs.put(None)
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            path, on_done = job
+            try:
+                self._compress(path)
+                if on_done is not None:
+                    on_done()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def _compress(self, path: str) -> None:
+        # Write to a temporary name so a crash never leaves a truncated .gz behind.
+        target = f"{path}.gz"
+        try:
+            source = open(path, 'rb')
+        except FileNotFoundError:
+            return  # already compressed or removed
+        with source, gzip.open(f"{target}.tmp", 'wb', self.compresslevel) as dest:
+            shutil.copyfileobj(source, dest, 1 << 20)
+        os.replace(f"{target}.tmp", target)
+        os.remove(path)
+
+
+class JsonLinesFileSink(BaseSink):
+    """
+    Buffered JSON-lines file sink with size- or time-based rotation.
+
+    Each record is written as one JSON object per line with the keys `ts`
+    (epoch nanoseconds), `level`, `module` and `message`, plus any extra fields.
+    Rotated segments are renamed with a timestamp suffix and gzipped on a
+    background thread, so compression never blocks the writing thread.
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 max_bytes: Optional[int] = None,
+                 rotate_interval: Optional[float] = None,
+                 backup_count: Optional[int] = None,
+                 compress: bool = True,
+                 buffer_size: int = 1 << 16):
+        """
+        Opens the log file for appending.
+
+        Args:
+            file_path (str): Path of the active log file.
+            max_bytes (int): Rotate once the file would grow beyond this size.
+            rotate_interval (float): Rotate after this many seconds.
+            backup_count (int): Number of rotated segments to keep; all when None.
+            compress (bool): Gzip rotated segments on a background thread.
+            buffer_size (int): Size of the write buffer in bytes.
+        """
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self._compressor = _CompressionWorker() if compress else None
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self) -> None:
+        self._file = open(self.file_path, 'ab', buffering=self.buffer_size)
+        self._size = self._file.tell()
+        self._opened_at = time.monotonic()
+
+    @staticmethod
+    def _encode(record: LogRecord) -> str:
+        data = {'ts': record.time_ns, 'level': record.level, 'module': record.module, 'message': record.message}
+        if record.extra:
+            for key, value in record.extra.items():
+                data.setdefault(key, value)
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str)
+
+    def emit(self, records: List[LogRecord]) -> None:
+        payload = ''.join(self._encode(record) + '\n' for record in records).encode('utf-8')
+        with self._lock:
+            if self._should_rotate(len(payload)):
+                self._rotate()
+            self._file.write(payload)
+            self._size += len(payload)
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self._size == 0:
+            return False
+        if self.max_bytes is not None and self._size + incoming > self.max_bytes:
+            return True
+        return self.rotate_interval is not None and time.monotonic() - self._opened_at >= self.rotate_interval
+
+    def _rotate(self) -> None:
+        self._file.close()
+        rotated = f"{self.file_path}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        os.replace(self.file_path, rotated)
+        self._open()
+        if self._compressor is not None:
+            self._compressor.submit(rotated, self._prune)
+        else:
+            self._prune()
+
+    def _prune(self) -> None:
+        if self.backup_count is None:
+            return
+        directory = os.path.dirname(self.file_path) or '.'
+        prefix = os.path.basename(self.file_path) + '.'
+        # With compression on, segments still queued for gzip are left alone; only finished ones count.
+        suffix = '.gz' if self._compressor is not None else ''
+        segments = sorted(name for name in os.listdir(directory)
+                          if name.startswith(prefix) and name.endswith(suffix) and not name.endswith('.tmp'))
+        for name in segments[:max(0, len(segments) - self.backup_count)]:
+            os.remove(os.path.join(directory, name))
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        if self._compressor is not None:
+            self._compressor.close()
+
+
 class Logger(BaseLogger):
     """Concrete implementation of the BaseLogger."""
 
@@ -44,46 +354,257 @@ class Logger(BaseLogger):
         'INFO': 'INF',
         'DEBUG': 'DBG',
         'ERROR': 'ERR',
+        'WARNING': 'WRN',
         'CLIENT': 'CLT'
     }
 
+    level_values = {
+        'DEBUG': 10,
+        'INFO': 20,
+        'CLIENT': 20,
+        'WARNING': 30,
+        'ERROR': 40
+    }
+
+    _min_level = 0
+    _module_levels: Dict[str, int] = {}
+    _resolved_levels: Dict[str, int] = {}
+    sinks: List[BaseSink] = [ConsoleSink()]
+    _writer: Optional[AsyncLogWriter] = None
+    _atexit_registered = False
+
     @staticmethod
     def _get_current_time() -> str:
         """Returns the current time in a formatted string."""
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     @staticmethod
-    def log(level: str, message: str) -> None:
+    def _format(record: LogRecord) -> str:
+        """Formats a record as `(PREFIX): timestamp - message`."""
+        prefix = Logger.log_levels.get(record.level, 'LOG')
+        current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.time_ns // 1_000_000_000))
+        return f"({prefix}): {current_time} - {record.message}"
+
+    @staticmethod
+    def _write(records: List[LogRecord]) -> None:
+        """Hands a batch of records to every sink; a failing sink does not affect the others."""
+        for sink in Logger.sinks:
+            try:
+                sink.emit(records)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    @staticmethod
+    def add_sink(sink: BaseSink) -> None:
+        """Adds a sink that receives every record from now on."""
+        Logger.sinks = Logger.sinks + [sink]
+        Logger._register_atexit()
+
+    @staticmethod
+    def remove_sink(sink: BaseSink) -> None:
+        """Stops sending records to a sink, flushing it first."""
+        Logger.flush()
+        Logger.sinks = [existing for existing in Logger.sinks if existing is not sink]
+        sink.flush()
+
+    @staticmethod
+    def set_sinks(sinks: List[BaseSink]) -> None:
+        """Replaces all sinks, e.g. `Logger.set_sinks([JsonLinesFileSink('app.log')])`."""
+        Logger.flush()
+        Logger.sinks = list(sinks)
+        Logger._register_atexit()
+
+    @staticmethod
+    def _register_atexit() -> None:
+        if not Logger._atexit_registered:
+            atexit.register(Logger.shutdown)
+            Logger._atexit_registered = True
+
+    @staticmethod
+    def shutdown() -> None:
+        """Drains queued records and flushes every sink. Runs automatically at exit."""
+        Logger.disable_async()
+        for sink in Logger.sinks:
+            try:
+                sink.flush()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    @staticmethod
+    def set_level(level: Optional[str], module: Optional[str] = None) -> None:
+        """
+        Sets the minimum level that is logged, globally or for one module.
+
+        A module level applies to that module and its submodules, e.g. a level
+        for 'pyutils.cachingutils' also covers 'pyutils.cachingutils.caching'.
+
+        Args:
+            level (str): The minimum level, or None to remove a module override.
+            module (str): Dotted module name; the global level when omitted.
+        """
+        if level is not None and level not in Logger.level_values:
+            raise ValueError(f"Unknown log level: {level}")
+        if module is None:
+            Logger._min_level = Logger.level_values[level] if level is not None else 0
+        else:
+            module_levels = dict(Logger._module_levels)
+            if level is None:
+                module_levels.pop(module, None)
+            else:
+                module_levels[module] = Logger.level_values[level]
+            Logger._module_levels = module_levels
+        Logger._resolved_levels = {}
+
+    @staticmethod
+    def _threshold(module: str) -> int:
+        """Returns the minimum level for a module, resolving and caching the longest prefix match."""
+        threshold = Logger._resolved_levels.get(module)
+        if threshold is None:
+            threshold = Logger._min_level
+            best = -1
+            for prefix, value in Logger._module_levels.items():
+                if len(prefix) > best and (module == prefix or module.startswith(prefix + '.')):
+                    best = len(prefix)
+                    threshold = value
+            Logger._resolved_levels[module] = threshold
+        return threshold
+
+    @staticmethod
+    def is_enabled(level: str, module: Optional[str] = None) -> bool:
+        """Returns True if a message at `level` from `module` would be logged."""
+        threshold = Logger._min_level
+        if Logger._module_levels:
+            if module is None:
+                module = sys._getframe(1).f_globals.get('__name__', '')
+            threshold = Logger._threshold(module)
+        return Logger.level_values.get(level, 20) >= threshold
+
+    @staticmethod
+    def _log(level: str,
+             message: Message,
+             args: tuple,
+             module: Optional[str],
+             extra: Optional[Dict[str, Any]]) -> None:
+        """Gates on level, then renders the deferred message and hands the record off."""
+        threshold = Logger._min_level
+        if Logger._module_levels:
+            if module is None:
+                module = sys._getframe(2).f_globals.get('__name__', '')
+            threshold = Logger._threshold(module)
+        if Logger.level_values.get(level, 20) < threshold:
+            return
+        if callable(message):
+            message = message()
+        elif args:
+            message = message % args
+        if module is None:
+            module = sys._getframe(2).f_globals.get('__name__', '')
+        record = LogRecord(time.time_ns(), level, message, module, extra)
+        writer = Logger._writer
+        if writer is not None:
+            writer.put(record)
+        else:
+            Logger._write([record])
+
+    @staticmethod
+    def enable_async(max_queue_size: int = 10000,
+                     overflow: str = 'block',
+                     batch_size: int = 512) -> AsyncLogWriter:
+        """
+        Switches the Logger to queued mode with a background writer thread.
+
+        Args:
+            max_queue_size (int): Maximum number of records waiting to be written.
+            overflow (str): 'block', 'drop_oldest' or 'drop' when the queue is full.
+            batch_size (int): Maximum number of records written per batch.
+
+        Returns:
+            AsyncLogWriter: The active writer, exposing the `dropped` counter.
+        """
+        Logger.disable_async()
+        Logger._writer = AsyncLogWriter(Logger._write, max_queue_size, overflow, batch_size)
+        Logger._register_atexit()
+        return Logger._writer
+
+    @staticmethod
+    def disable_async(timeout: Optional[float] = None) -> None:
+        """Drains any queued records and returns to synchronous logging."""
+        writer = Logger._writer
+        Logger._writer = None
+        if writer is not None:
+            writer.close(timeout)
+
+    @staticmethod
+    def flush(timeout: Optional[float] = None) -> bool:
+        """Waits until all queued records are written and flushes the sinks. Returns False on timeout."""
+        writer = Logger._writer
+        if writer is not None and not writer.flush(timeout):
+            return False
+        for sink in Logger.sinks:
+            sink.flush()
+        return True
+
+    @staticmethod
+    def log(level: str,
+            message: Message,
+            *args: Any,
+            module: Optional[str] = None,
+            extra: Optional[Dict[str, Any]] = None) -> None:
         """
         Finalizes and logs the message with the appropriate level and timestamp.
 
+        The message is only rendered if the level is enabled: `%`-style `args`
+        are applied lazily, and a callable message is called to produce the text.
+        That rendering always happens on the calling thread, so the record holds
+        the values as they were at the call. In async mode the record is then
+        only queued: building the output line (prefix, timestamp) and writing it
+        to the sinks happen on the background writer thread.
+
         Args:
-            level (str): The log level (e.g., ERROR, INFO, DEBUG, CLIENT).
-            message (str): The message to log.
+            level (str): The log level (e.g., ERROR, WARNING, INFO, DEBUG, CLIENT).
+            message (str | Callable): The message, a `%` format string, or a callable returning it.
+            *args: Values substituted into a `%` format string.
+            module (str): Module used for per-module levels; defaults to the caller's module.
+            extra (dict): Additional structured fields passed through to the sinks.
         """
-        prefix = Logger.log_levels.get(level, 'LOG')
-        current_time = Logger._get_current_time()
-        log_message = f"({prefix}): {current_time} - {message}"
-        print(log_message)
+        Logger._log(level, message, args, module, extra)
 
     @staticmethod
-    def error(msg: str) -> None:
+    def error(msg: Message,
+              *args: Any,
+              module: Optional[str] = None,
+              extra: Optional[Dict[str, Any]] = None) -> None:
         """Logs an error message."""
-        Logger.log("ERROR", msg)
+        Logger._log("ERROR", msg, args, module, extra)
+
+    @staticmethod
+    def warning(msg: Message,
+                *args: Any,
+                module: Optional[str] = None,
+                extra: Optional[Dict[str, Any]] = None) -> None:
+        """Logs a warning message."""
+        Logger._log("WARNING", msg, args, module, extra)
 
     @staticmethod
-    def client(msg: str) -> None:
+    def client(msg: Message,
+               *args: Any,
+               module: Optional[str] = None,
+               extra: Optional[Dict[str, Any]] = None) -> None:
         """Logs a client-related message."""
-        Logger.log("CLIENT", msg)
+        Logger._log("CLIENT", msg, args, module, extra)
 
     @staticmethod
-    def debug(msg: str) -> None:
+    def debug(msg: Message,
+              *args: Any,
+              module: Optional[str] = None,
+              extra: Optional[Dict[str, Any]] = None) -> None:
         """Logs a debug message."""
-        Logger.log("DEBUG", msg)
+        Logger._log("DEBUG", msg, args, module, extra)
 
     @staticmethod
-    def info(msg: str) -> None:
+    def info(msg: Message,
+             *args: Any,
+             module: Optional[str] = None,
+             extra: Optional[Dict[str, Any]] = None) -> None:
         """Logs an informational message."""
-        Logger.log("INFO", msg)
-
-
+        Logger._log("INFO", msg, args, module, extra)
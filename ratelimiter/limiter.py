@@ -1,11 +1,127 @@
+import asyncio
+import functools
+import inspect
+import itertools
 import time
+import uuid
+from abc import ABC, abstractmethod
+from array import array
 from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional
 from pyutils.logger.logger import Logger
 
-class RateLimiter:
-    def __init__(self, rate: float, per: float):
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+def _wait(reserve: Callable[[], float], timeout: Optional[float]) -> bool:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = reserve()
+        if wait <= 0:
+            return True
+        if deadline is not None and time.monotonic() + wait > deadline:
+            return False
+        time.sleep(wait)
+
+
+async def _wait_async(reserve: Callable[[], float], timeout: Optional[float]) -> bool:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = reserve()
+        if wait <= 0:
+            return True
+        if deadline is not None and time.monotonic() + wait > deadline:
+            return False
+        await asyncio.sleep(wait)
+
+
+def _log_result(acquired: bool) -> None:
+    if acquired:
+        Logger.info("Token acquired, proceeding with request.")
+    else:
+        Logger.warning("Rate limit exceeded. Request denied.")
+
+
+class BaseRateLimiter(ABC):
+    """Blocking, non-blocking and async acquisition built on a single `_reserve` primitive."""
+
+    log = False
+
+    @abstractmethod
+    def _reserve(self, tokens: float) -> float:
+        """Takes `tokens` if they are available and returns 0, else returns the seconds until they will be."""
+        pass
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Takes tokens if available right now, without waiting."""
+        acquired = self._reserve(tokens) <= 0
+        if self.log:
+            _log_result(acquired)
+        return acquired
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until `tokens` are available and takes them.
+
+        Sleeps exactly until the bucket will hold enough tokens instead of polling.
+        Returns False without sleeping if they cannot become available within `timeout`.
+        """
+        acquired = _wait(lambda: self._reserve(tokens), timeout)
+        if self.log:
+            _log_result(acquired)
+        return acquired
+
+    async def acquire_async(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Like `acquire`, but waits with `asyncio.sleep` so the event loop keeps running."""
+        acquired = await _wait_async(lambda: self._reserve(tokens), timeout)
+        if self.log:
+            _log_result(acquired)
+        return acquired
+
+    def limit(self, tokens: float = 1, timeout: Optional[float] = None) -> Callable:
+        """Decorator that acquires `tokens` before each call, raising RateLimitExceeded on timeout."""
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if not await self.acquire_async(tokens, timeout):
+                        raise RateLimitExceeded(f"Rate limit exceeded for '{func.__name__}'.")
+                    return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.acquire(tokens, timeout):
+                    raise RateLimitExceeded(f"Rate limit exceeded for '{func.__name__}'.")
+                return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def __call__(self, func: Callable) -> Callable:
+        return self.limit()(func)
+
+    def __enter__(self) -> 'BaseRateLimiter':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        pass
+
+    async def __aenter__(self) -> 'BaseRateLimiter':
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        pass
+
+
+class RateLimiter(BaseRateLimiter):
+    def __init__(self, rate: float, per: float, log: bool = False):
         self.rate = rate
         self.per = per
+        self.log = log
         self.tokens = rate
         self.last_check = time.monotonic()
         self.lock = Lock()
@@ -18,12 +134,274 @@ class RateLimiter:
             self.tokens = self.rate
         self.last_check = now
 
-    def acquire(self) -> bool:
+    def _reserve(self, tokens: float) -> float:
+        if tokens > self.rate:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket holding at most {self.rate}.")
         with self.lock:
             self._add_tokens()
-            if self.tokens >= 1:
-                self.tokens -= 1
-                Logger.info("Token acquired, proceeding with request.")
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) * self.per / self.rate
+
+
+class _Stripe:
+    """Bucket state for the keys hashed to one stripe, kept in parallel arrays indexed by slot."""
+
+    __slots__ = ('lock', 'slots', 'tokens', 'stamps', 'free', 'last_sweep')
+
+    def __init__(self):
+        self.lock = Lock()
+        self.slots: Dict[Hashable, int] = {}
+        self.tokens = array('d')
+        self.stamps = array('d')
+        self.free: List[int] = []
+        self.last_sweep = time.monotonic()
+
+
+class KeyedRateLimiter:
+    """
+    Token bucket per key (API key, client IP, ...) for very large key counts.
+
+    Keys are spread over a fixed number of lock stripes. Each stripe stores its
+    buckets as two float arrays plus a key-to-slot dict, so a key costs one dict
+    entry and 16 bytes instead of a full limiter object and lock. A bucket idle
+    for at least `idle_after` seconds (never less than `per`) has refilled
+    completely and is indistinguishable from a new one, so stripes lazily drop
+    such buckets and reuse their slots.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 per: float,
+                 stripes: int = 64,
+                 idle_after: Optional[float] = None,
+                 log: bool = False):
+        self.rate = rate
+        self.per = per
+        self.log = log
+        self.idle_after = per if idle_after is None else max(idle_after, per)
+        count = 1
+        while count < stripes:
+            count <<= 1
+        self._mask = count - 1
+        self._stripes = [_Stripe() for _ in range(count)]
+        self.evictions = 0
+
+    def _reserve(self, key: Hashable, tokens: float) -> float:
+        if tokens > self.rate:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket holding at most {self.rate}.")
+        stripe = self._stripes[hash(key) & self._mask]
+        now = time.monotonic()
+        with stripe.lock:
+            if now - stripe.last_sweep >= self.idle_after:
+                self._sweep(stripe, now)
+            slot = stripe.slots.get(key)
+            if slot is None:
+                available = self.rate
+                if stripe.free:
+                    slot = stripe.free.pop()
+                else:
+                    slot = len(stripe.tokens)
+                    stripe.tokens.append(0.0)
+                    stripe.stamps.append(0.0)
+                stripe.slots[key] = slot
+            else:
+                available = stripe.tokens[slot] + (now - stripe.stamps[slot]) * self.rate / self.per
+                if available > self.rate:
+                    available = self.rate
+            stripe.stamps[slot] = now
+            if available >= tokens:
+                stripe.tokens[slot] = available - tokens
+                return 0.0
+            stripe.tokens[slot] = available
+            return (tokens - available) * self.per / self.rate
+
+    def _sweep(self, stripe: _Stripe, now: float) -> None:
+        cutoff = now - self.idle_after
+        stamps = stripe.stamps
+        idle = [key for key, slot in stripe.slots.items() if stamps[slot] <= cutoff]
+        for key in idle:
+            stripe.free.append(stripe.slots.pop(key))
+        stripe.last_sweep = now
+        self.evictions += len(idle)
+
+    def try_acquire(self, key: Hashable, tokens: float = 1) -> bool:
+        acquired = self._reserve(key, tokens) <= 0
+        if self.log:
+            _log_result(acquired)
+        return acquired
+
+    def acquire(self, key: Hashable, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        acquired = _wait(lambda: self._reserve(key, tokens), timeout)
+        if self.log:
+            _log_result(acquired)
+        return acquired
+
+    async def acquire_async(self, key: Hashable, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        acquired = await _wait_async(lambda: self._reserve(key, tokens), timeout)
+        if self.log:
+            _log_result(acquired)
+        return acquired
+
+    def __len__(self) -> int:
+        return sum(len(stripe.slots) for stripe in self._stripes)
+
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local per_us = tonumber(ARGV[2])
+local need = tonumber(ARGV[3])
+local want = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = rate
+    ts = now
+end
+tokens = math.min(rate, tokens + math.max(0, now - ts) * rate / per_us)
+local granted = 0
+local wait = 0
+if tokens >= need then
+    granted = math.max(need, math.min(want, tokens))
+    tokens = tokens - granted
+else
+    wait = math.ceil((need - tokens) * per_us / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(per_us / 1000))
+return {tostring(granted), wait}
+"""
+
+_SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window_us = tonumber(ARGV[2])
+local need = tonumber(ARGV[3])
+local want = tonumber(ARGV[4])
+local id = ARGV[5]
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window_us)
+local free = limit - redis.call('ZCARD', KEYS[1])
+if free >= need then
+    local granted = math.min(want, free)
+    for i = 1, granted do
+        redis.call('ZADD', KEYS[1], now, id .. ':' .. i)
+    end
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window_us / 1000))
+    return {tostring(granted), 0}
+end
+local index = need - free - 1
+local entry = redis.call('ZRANGE', KEYS[1], index, index, 'WITHSCORES')
+return {'0', tonumber(entry[2]) + window_us - now}
+"""
+
+
+class RedisRateLimiter(BaseRateLimiter):
+    """
+    Rate limiter shared by every process and node that uses the same Redis `key`.
+
+    Each decision is one atomic server-side script call timed by the Redis clock,
+    using either a token bucket ('token_bucket') or a sliding-window log of grants
+    ('sliding_window', whole tokens only). With `lease` > 1 a call takes up to
+    `lease` tokens at once and serves later acquisitions from that local lease,
+    trading some fairness for fewer round trips on very hot keys; leased tokens
+    are discarded after `per` seconds. When Redis is unreachable and `fallback`
+    is set, decisions fall back to a local RateLimiter, and Redis is only tried
+    again every `recheck_interval` seconds until it answers.
+    `client` replaces the pooled redis client, e.g. with an in-memory stand-in.
+    """
+
+    _SCRIPTS = {
+        'token_bucket': _TOKEN_BUCKET_SCRIPT,
+        'sliding_window': _SLIDING_WINDOW_SCRIPT,
+    }
+
+    def __init__(self,
+                 rate: float,
+                 per: float,
+                 key: str,
+                 algorithm: str = 'token_bucket',
+                 lease: int = 0,
+                 fallback: bool = True,
+                 recheck_interval: float = 1.0,
+                 host: str = 'localhost',
+                 port: int = 6379,
+                 db: int = 0,
+                 max_connections: int = 50,
+                 client: Any = None,
+                 log: bool = False):
+        if algorithm not in self._SCRIPTS:
+            raise ValueError(f"Unknown algorithm: {algorithm}. Use one of {list(self._SCRIPTS)}.")
+        import redis
+        if client is None:
+            from pyutils.cachingutils.caching import RedisCache
+            client = redis.Redis(connection_pool=RedisCache.shared_pool(host, port, db, max_connections))
+        self.rate = rate
+        self.per = per
+        self.key = key
+        self.algorithm = algorithm
+        self.lease = lease
+        self.log = log
+        self.client = client
+        self.recheck_interval = recheck_interval
+        self.degraded = False
+        self._recheck_at = 0.0
+        self._script = client.register_script(self._SCRIPTS[algorithm])
+        self._errors = (redis.ConnectionError, redis.TimeoutError)
+        self._local = RateLimiter(rate, per) if fallback else None
+        self._lock = Lock()
+        self._leased = 0.0
+        self._lease_expires = 0.0
+        self._id = uuid.uuid4().hex
+        self._sequence = itertools.count()
+
+    def _take_leased(self, tokens: float) -> bool:
+        with self._lock:
+            if self._leased >= tokens and time.monotonic() < self._lease_expires:
+                self._leased -= tokens
                 return True
-            Logger.warning("Rate limit exceeded. Request denied.")
             return False
+
+    def _add_leased(self, tokens: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._lease_expires:
+                self._leased = 0.0
+            self._leased += tokens
+            self._lease_expires = now + self.per
+
+    def _reserve(self, tokens: float) -> float:
+        if tokens > self.rate:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket holding at most {self.rate}.")
+        if self.algorithm == 'sliding_window' and tokens != int(tokens):
+            raise ValueError("The sliding window limiter only grants whole tokens.")
+        if self.lease > tokens and self._take_leased(tokens):
+            return 0.0
+        if self.degraded and time.monotonic() < self._recheck_at:
+            return self._local._reserve(tokens)
+        want = max(tokens, min(self.lease, self.rate))
+        try:
+            granted, wait = self._script(keys=[self.key],
+                                         args=[self.rate, int(self.per * 1_000_000), tokens, want,
+                                               f"{self._id}:{next(self._sequence)}"])
+        except self._errors as e:
+            if self._local is None:
+                raise
+            self._recheck_at = time.monotonic() + self.recheck_interval
+            if not self.degraded:
+                self.degraded = True
+                Logger.warning("Redis unreachable for rate limit '%s', limiting locally: %s", self.key, e)
+            return self._local._reserve(tokens)
+        if self.degraded:
+            self.degraded = False
+            Logger.info("Redis reachable again for rate limit '%s'.", self.key)
+        granted = float(granted)
+        if granted < tokens:
+            return max(int(wait), 1) / 1_000_000
+        if granted > tokens:
+            self._add_leased(granted - tokens)
+        return 0.0
@@ -1,40 +1,418 @@
+import asyncio
 import time
 import functools
-from typing import Callable, Any, Optional
+import inspect
+import random
+import threading
+from typing import Callable, Any, Dict, Optional, Tuple
 from pyutils.logger.logger import Logger
 
 
+class RetryBudget:
+    """
+    Token bucket shared by Retry decorators that caps retries to a fraction of calls.
+
+    Every call deposits `ratio` tokens (capped at `max_tokens`) and every retry
+    withdraws one, so during an outage retries add at most about `ratio` extra
+    load instead of multiplying it by `max_attempts`. `min_per_second` tokens
+    are added over time so rarely-called functions can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0, min_per_second: float = 1.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.min_per_second = min_per_second
+        self.tokens = max_tokens
+        self.last_refill = time.monotonic()
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, amount: float) -> None:
+        now = time.monotonic()
+        amount += (now - self.last_refill) * self.min_per_second
+        self.last_refill = now
+        self.tokens = min(self.max_tokens, self.tokens + amount)
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill(self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill(0.0)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'tokens': self.tokens, 'retries': self.retries, 'denied': self.denied}
+
+
 class Retry:
+    JITTERS = (None, 'full', 'equal', 'decorrelated')
+
     def __init__(self, 
                  max_attempts: int = 3, 
                  delay: float = 1.0, 
                  backoff: float = 2.0, 
                  exceptions: tuple = (Exception,), 
-                 final_callback: Optional[Callable] = None):
+                 final_callback: Optional[Callable] = None,
+                 jitter: Optional[str] = None,
+                 max_delay: Optional[float] = None,
+                 deadline: Optional[float] = None,
+                 budget: Optional[RetryBudget] = None,
+                 is_retryable: Optional[Callable[[BaseException], bool]] = None):
+        """
+        Retries sync or async callables on `exceptions` with exponential backoff.
+
+        `jitter` randomises each delay: 'full' sleeps uniformly up to the backoff
+        delay, 'equal' keeps half of it fixed, and 'decorrelated' grows from the
+        previous sleep instead of the attempt number. `max_delay` caps single
+        sleeps, `deadline` caps the total seconds spent including sleeps, and a
+        shared `budget` stops retrying once retries exceed its share of calls.
+        Errors among `exceptions` for which `is_retryable(error)` is false are
+        raised at once.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if jitter not in self.JITTERS:
+            raise ValueError(f"Unknown jitter: {jitter}. Use one of {list(self.JITTERS)}.")
         self.max_attempts = max_attempts
         self.delay = delay
         self.backoff = backoff
         self.exceptions = exceptions
         self.final_callback = final_callback
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.budget = budget
+        self.is_retryable = is_retryable
+
+    def _backoff(self, attempts: int, previous: float) -> float:
+        if self.jitter == 'decorrelated':
+            sleep_time = random.uniform(self.delay, max(self.delay, previous * 3))
+        else:
+            sleep_time = self.delay * (self.backoff ** (attempts - 1))
+        if self.max_delay is not None:
+            sleep_time = min(sleep_time, self.max_delay)
+        if self.jitter == 'full':
+            sleep_time = random.uniform(0, sleep_time)
+        elif self.jitter == 'equal':
+            sleep_time = sleep_time / 2 + random.uniform(0, sleep_time / 2)
+        return sleep_time
+
+    def _next_delay(self, func: Callable, attempts: int, error: Exception,
+                    started: float, previous: float) -> Optional[float]:
+        """Returns how long to sleep before the next attempt, or None to give up."""
+        Logger.warning("Function '%s' failed on attempt %d. Error: %s", func.__name__, attempts, error)
+        reason = None
+        sleep_time = 0.0
+        if attempts >= self.max_attempts:
+            Logger.error("Function '%s' failed after %d attempts.", func.__name__, attempts)
+        else:
+            sleep_time = self._backoff(attempts, previous)
+            if self.deadline is not None and time.monotonic() + sleep_time - started > self.deadline:
+                reason = f"deadline of {self.deadline:.2f} seconds"
+            elif self.budget is not None and not self.budget.withdraw():
+                reason = "retry budget exhausted"
+            else:
+                Logger.info("Retrying in %.2f seconds...", sleep_time)
+                return sleep_time
+            Logger.error("Function '%s' gave up after %d attempts: %s.", func.__name__, attempts, reason)
+        if self.final_callback:
+            self.final_callback()
+        return None
 
     def __call__(self, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if self.budget is not None:
+                    self.budget.deposit()
+                started = time.monotonic()
+                attempts = 0
+                sleep_time = self.delay
+                while True:
+                    attempts += 1
+                    try:
+                        result = await func(*args, **kwargs)
+                    except self.exceptions as e:
+                        if self.is_retryable is not None and not self.is_retryable(e):
+                            raise
+                        sleep_time = self._next_delay(func, attempts, e, started, sleep_time)
+                        if sleep_time is None:
+                            raise
+                        await asyncio.sleep(sleep_time)
+                    else:
+                        Logger.info("Function '%s' succeeded on attempt %d.", func.__name__, attempts)
+                        return result
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if self.budget is not None:
+                self.budget.deposit()
+            started = time.monotonic()
             attempts = 0
-            while attempts < self.max_attempts:
+            sleep_time = self.delay
+            while True:
+                attempts += 1
                 try:
                     result = func(*args, **kwargs)
-                    Logger.info(f"Function '{func.__name__}' succeeded on attempt {attempts + 1}.")
-                    return result
                 except self.exceptions as e:
-                    attempts += 1
-                    Logger.warning(f"Function '{func.__name__}' failed on attempt {attempts}. Error: {e}")
-                    if attempts < self.max_attempts:
-                        sleep_time = self.delay * (self.backoff ** (attempts - 1))
-                        Logger.info(f"Retrying in {sleep_time:.2f} seconds...")
-                        time.sleep(sleep_time)
-            Logger.error(f"Function '{func.__name__}' failed after {self.max_attempts} attempts.")
-            if self.final_callback:
-                self.final_callback()
-            raise e
+                    if self.is_retryable is not None and not self.is_retryable(e):
+                        raise
+                    sleep_time = self._next_delay(func, attempts, e, started, sleep_time)
+                    if sleep_time is None:
+                        raise
+                    time.sleep(sleep_time)
+                else:
+                    Logger.info("Function '%s' succeeded on attempt %d.", func.__name__, attempts)
+                    return result
+        return wrapper
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open; retry after {retry_after:.2f} seconds.")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while a dependency is failing instead of letting every caller retry into it.
+
+    Outcomes are counted in a rolling `window` of seconds split into `buckets`.
+    The circuit opens when the window holds `failure_threshold` failures, or, if
+    `failure_rate` is set, when at least `minimum_calls` calls were made and that
+    fraction of them failed. An open circuit raises CircuitOpenError without
+    calling through until `recovery_timeout` has passed, then goes half-open and
+    lets up to `half_open_max_calls` trial calls through: if they all succeed
+    the circuit closes, and any failure opens it again. Only `exceptions` for
+    which `is_failure(error)` is true (all of them when it is None) count as
+    failures; other errors mean the dependency answered and count as
+    successes. `on_state_change(breaker, old_state, new_state)` is called on
+    every transition, and `stats()` reports counters for metrics.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 failure_rate: Optional[float] = None,
+                 minimum_calls: int = 10,
+                 window: float = 60.0,
+                 buckets: int = 10,
+                 recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1,
+                 exceptions: tuple = (Exception,),
+                 is_failure: Optional[Callable[[BaseException], bool]] = None,
+                 name: str = 'default',
+                 on_state_change: Optional[Callable[['CircuitBreaker', str, str], None]] = None):
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.exceptions = exceptions
+        self.is_failure = is_failure
+        self.name = name
+        self.on_state_change = on_state_change
+        self.state = self.CLOSED
+        self._lock = threading.Lock()
+        self._bucket_width = window / buckets
+        self._calls = [0] * buckets
+        self._failures = [0] * buckets
+        self._epoch = int(time.monotonic() / self._bucket_width)
+        self._window_calls = 0
+        self._window_failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def _advance(self, now: float) -> int:
+        epoch = int(now / self._bucket_width)
+        size = len(self._calls)
+        if epoch != self._epoch:
+            for i in range(self._epoch + 1, self._epoch + 1 + min(epoch - self._epoch, size)):
+                slot = i % size
+                self._window_calls -= self._calls[slot]
+                self._window_failures -= self._failures[slot]
+                self._calls[slot] = 0
+                self._failures[slot] = 0
+            self._epoch = epoch
+        return epoch % size
+
+    def _reset_window(self) -> None:
+        for i in range(len(self._calls)):
+            self._calls[i] = 0
+            self._failures[i] = 0
+        self._window_calls = 0
+        self._window_failures = 0
+
+    def _tripped(self) -> bool:
+        if self.failure_rate is None:
+            return self._window_failures >= self.failure_threshold
+        return (self._window_calls >= self.minimum_calls
+                and self._window_failures >= self.failure_rate * self._window_calls)
+
+    def _transition(self, state: str) -> Tuple[str, str]:
+        old, self.state = self.state, state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self.opened += 1
+        elif state == self.CLOSED:
+            self._reset_window()
+        self._trials = 0
+        self._trial_successes = 0
+        return old, state
+
+    def _notify(self, transition: Optional[Tuple[str, str]]) -> None:
+        if transition is None or transition[0] == transition[1]:
+            return
+        old, new = transition
+        if new == self.OPEN:
+            Logger.warning("Circuit '%s' opened (was %s).", self.name, old)
+        else:
+            Logger.info("Circuit '%s' is now %s.", self.name, new)
+        if self.on_state_change is not None:
+            self.on_state_change(self, old, new)
+
+    def _before_call(self) -> None:
+        if self.state == self.CLOSED:
+            return
+        transition = None
+        with self._lock:
+            if self.state == self.OPEN:
+                retry_after = self._opened_at + self.recovery_timeout - time.monotonic()
+                if retry_after > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, retry_after)
+                transition = self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._trials >= self.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._trials += 1
+        self._notify(transition)
+
+    def _release(self) -> None:
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def _record(self, failed: bool) -> None:
+        transition = None
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.successes += 1
+            if self.state == self.CLOSED:
+                slot = self._advance(time.monotonic())
+                self._calls[slot] += 1
+                self._window_calls += 1
+                if failed:
+                    self._failures[slot] += 1
+                    self._window_failures += 1
+                    if self._tripped():
+                        transition = self._transition(self.OPEN)
+            elif self.state == self.HALF_OPEN:
+                if failed:
+                    transition = self._transition(self.OPEN)
+                else:
+                    self._trial_successes += 1
+                    if self._trial_successes >= self.half_open_max_calls:
+                        transition = self._transition(self.CLOSED)
+        self._notify(transition)
+
+    def _failed(self, error: BaseException, is_failure: Optional[Callable[[BaseException], bool]]) -> bool:
+        is_failure = is_failure or self.is_failure
+        return is_failure is None or is_failure(error)
+
+    def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        return self._call(func, args, kwargs, None)
+
+    async def call_async(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        return await self._call_async(func, args, kwargs, None)
+
+    def _call(self, func: Callable, args: tuple, kwargs: Dict[str, Any],
+              is_failure: Optional[Callable[[BaseException], bool]]) -> Any:
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except self.exceptions as e:
+            self._record(self._failed(e, is_failure))
+            raise
+        except Exception:
+            self._record(False)
+            raise
+        except BaseException:
+            self._release()
+            raise
+        self._record(False)
+        return result
+
+    async def _call_async(self, func: Callable, args: tuple, kwargs: Dict[str, Any],
+                          is_failure: Optional[Callable[[BaseException], bool]]) -> Any:
+        self._before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except self.exceptions as e:
+            self._record(self._failed(e, is_failure))
+            raise
+        except Exception:
+            self._record(False)
+            raise
+        except BaseException:
+            self._release()
+            raise
+        self._record(False)
+        return result
+
+    def __call__(self, func: Callable) -> Callable:
+        return self.guard(func)
+
+    def guard(self, func: Callable, is_failure: Optional[Callable[[BaseException], bool]] = None) -> Callable:
+        """
+        Wraps `func` in this breaker like the decorator does.
+
+        `is_failure` replaces the breaker's own predicate for calls through this
+        wrapper only, so one breaker can be shared by callers that classify
+        errors differently.
+        """
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await self._call_async(func, args, kwargs, is_failure)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self._call(func, args, kwargs, is_failure)
         return wrapper
+
+    def reset(self) -> None:
+        """Forces the circuit closed and clears the failure window."""
+        with self._lock:
+            transition = self._transition(self.CLOSED)
+        self._notify(transition)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._advance(time.monotonic())
+            return {'state': self.state, 'window_calls': self._window_calls,
+                    'window_failures': self._window_failures, 'successes': self.successes,
+                    'failures': self.failures, 'rejected': self.rejected, 'opened': self.opened}
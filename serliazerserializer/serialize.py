@@ -1,8 +1,18 @@
+import base64
+import dataclasses
 import json
+import math
+import os
+import threading
+import typing
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
-from typing import Any, Dict
-from pyutils.logger.log import Logger
+from datetime import date, datetime
+from decimal import Decimal
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pyutils.logger.logger import Logger
+
+Buffer = Union[bytearray, memoryview]
 
 
 class SerializationError(Exception):
@@ -13,6 +23,14 @@ class DeserializationError(Exception):
     pass
 
 
+def _write_buffer(payload: Union[bytes, memoryview], buffer: Buffer, offset: int) -> int:
+    end = offset + len(payload)
+    if offset > len(buffer) or (not isinstance(buffer, bytearray) and end > len(buffer)):
+        raise SerializationError(f"Buffer of {len(buffer)} bytes cannot hold {len(payload)} bytes at offset {offset}.")
+    buffer[offset:end] = payload
+    return end
+
+
 class BaseSerializer(ABC):
     @abstractmethod
     def serialize(self, data: Any) -> str:
@@ -22,72 +40,743 @@ class BaseSerializer(ABC):
     def deserialize(self, string: str) -> Any:
         pass
 
+    def dumps(self, data: Any) -> bytes:
+        return self.serialize(data).encode('utf-8')
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if not isinstance(data, str):
+            data = bytes(data).decode('utf-8')
+        return self.deserialize(data)
+
+    def dumps_into(self, data: Any, buffer: Buffer, offset: int = 0) -> int:
+        """
+        Writes the encoded bytes into `buffer` at `offset` and returns the offset just past them.
+
+        A bytearray grows as needed, so one buffer can be reused across calls; a
+        fixed-size writable memoryview must already be large enough.
+        """
+        return _write_buffer(self.dumps(data), buffer, offset)
+
+
+_NONE_TYPE = type(None)
+_MISSING = object()
+
+
+def _fail(path: str, expected: str, value: Any) -> None:
+    raise DeserializationError(f"Invalid value for {path}: expected {expected}, got {type(value).__name__}.")
+
+
+def _missing(path: str) -> None:
+    raise DeserializationError(f"Missing required field {path}.")
+
+
+def _coerce(convert: Callable[[Any], Any], value: Any, path: str, expected: str) -> Any:
+    try:
+        return convert(value)
+    except (TypeError, ValueError, ArithmeticError):
+        _fail(path, expected, value)
+
+
+def _parse_bool(value: Any) -> bool:
+    text = value.strip().lower()
+    if text in ('true', '1'):
+        return True
+    if text in ('false', '0'):
+        return False
+    raise ValueError(value)
+
+
+def _is_typed_dict(cls: Any) -> bool:
+    return isinstance(cls, type) and issubclass(cls, dict) and hasattr(cls, '__required_keys__')
+
+
+# (converter, expected name) for scalar types that travel as strings in JSON and XML.
+_TEXT_TYPES: Dict[type, Tuple[Callable[[Any], Any], str]] = {
+    datetime: (datetime.fromisoformat, 'datetime'),
+    date: (date.fromisoformat, 'date'),
+    Decimal: (Decimal, 'decimal'),
+    bytes: (lambda value: base64.b64decode(value, validate=True), 'base64 bytes'),
+}
+
+
+def _is_list_type(tp: Any) -> bool:
+    if typing.get_origin(tp) is Union:
+        inner = [arg for arg in typing.get_args(tp) if arg is not _NONE_TYPE]
+        return len(inner) == 1 and _is_list_type(inner[0])
+    return typing.get_origin(tp) is list
+
+
+class _Compiler:
+    """Generates the source of one schema's functions, keeping referenced objects in a shared namespace."""
+
+    def __init__(self):
+        self.namespace: Dict[str, Any] = {
+            '_fail': _fail, '_missing': _missing, '_coerce': _coerce, '_MISSING': _MISSING,
+            '_b64encode': base64.b64encode, '_parse_bool': _parse_bool,
+            'int': int, 'float': float, 'str': str, 'bool': bool, 'list': list, 'dict': dict,
+        }
+        self._count = 0
+
+    def bind(self, value: Any, prefix: str) -> str:
+        self._count += 1
+        name = f"_{prefix}{self._count}"
+        self.namespace[name] = value
+        return name
+
+    def define(self, source: str, name: str) -> Callable:
+        exec(source, self.namespace)
+        return self.namespace[name]
+
+    def encode_expr(self, tp: Any, expr: str, depth: int = 0) -> str:
+        """Returns an expression turning `expr`, of type `tp`, into JSON-compatible builtins."""
+        origin, args = typing.get_origin(tp), typing.get_args(tp)
+        if tp in (int, float, str, bool, _NONE_TYPE, Any):
+            return expr
+        if tp in (datetime, date):
+            return f"{expr}.isoformat()"
+        if tp is Decimal:
+            return f"str({expr})"
+        if tp is bytes:
+            return f"_b64encode({expr}).decode('ascii')"
+        if origin is Union:
+            inner = [arg for arg in args if arg is not _NONE_TYPE]
+            if len(inner) == 1:
+                value = self.encode_expr(inner[0], expr, depth)
+                return expr if value == expr else f"(None if {expr} is None else {value})"
+        elif origin is list:
+            item = f"_i{depth}"
+            value = self.encode_expr(args[0] if args else Any, item, depth + 1)
+            return f"list({expr})" if value == item else f"[{value} for {item} in {expr}]"
+        elif origin is dict:
+            key, item = f"_k{depth}", f"_v{depth}"
+            value = self.encode_expr(args[1] if args else Any, item, depth + 1)
+            return f"dict({expr})" if value == item else f"{{{key}: {value} for {key}, {item} in {expr}.items()}}"
+        else:
+            schema = _nested_schema(tp)
+            if schema is not None:
+                return f"{self.bind(schema, 'schema')}.encode({expr})"
+        raise TypeError(f"Unsupported field type for a record schema: {tp!r}")
+
+    def decode_lines(self, tp: Any, var: str, path: str, coerce: bool, indent: int) -> List[str]:
+        """Returns statements that validate `var` against `tp` and convert it in place."""
+        pad = ' ' * indent
+        origin, args = typing.get_origin(tp), typing.get_args(tp)
+        if tp is Any:
+            return []
+        if tp is str:
+            if coerce:
+                return [f"{pad}if {var} is None:", f"{pad}    {var} = ''",
+                        f"{pad}elif {var}.__class__ is not str:", f"{pad}    _fail({path!r}, 'str', {var})"]
+            return [f"{pad}if {var}.__class__ is not str:", f"{pad}    _fail({path!r}, 'str', {var})"]
+        if tp in (int, float, bool):
+            name = tp.__name__
+            if coerce:
+                convert = '_parse_bool' if tp is bool else name
+                return [f"{pad}if {var}.__class__ is not {name}:",
+                        f"{pad}    {var} = _coerce({convert}, {var}, {path!r}, {name!r})"]
+            if tp is float:
+                return [f"{pad}if {var}.__class__ is not float:",
+                        f"{pad}    if {var}.__class__ is int:", f"{pad}        {var} = float({var})",
+                        f"{pad}    else:", f"{pad}        _fail({path!r}, 'float', {var})"]
+            return [f"{pad}if {var}.__class__ is not {name}:", f"{pad}    _fail({path!r}, {name!r}, {var})"]
+        if tp is _NONE_TYPE:
+            return [f"{pad}if {var} is not None:", f"{pad}    _fail({path!r}, 'null', {var})"]
+        if tp in _TEXT_TYPES:
+            convert, expected = _TEXT_TYPES[tp]
+            cls_name, convert_name = self.bind(tp, 'type'), self.bind(convert, 'parse')
+            lines = [f"{pad}if {var}.__class__ is not {cls_name}:",
+                     f"{pad}    {var} = _coerce({convert_name}, {var}, {path!r}, {expected!r})"]
+            if coerce:
+                # Empty XML elements have no text at all.
+                lines[1:1] = [f"{pad}    if {var} is None:", f"{pad}        {var} = ''"]
+            return lines
+        if origin is Union:
+            inner = [arg for arg in args if arg is not _NONE_TYPE]
+            if len(inner) == 1:
+                lines = self.decode_lines(inner[0], var, path, coerce, indent + 4) or [f"{pad}    pass"]
+                return [f"{pad}if {var} is not None:"] + lines
+        elif origin is list:
+            if coerce:
+                lines = [f"{pad}if {var}.__class__ is not list:", f"{pad}    {var} = [{var}]"]
+            else:
+                lines = [f"{pad}if {var}.__class__ is not list:", f"{pad}    _fail({path!r}, 'list', {var})"]
+            item = self.converter(args[0] if args else Any, f"{path}[]", coerce)
+            if item is not None:
+                lines.append(f"{pad}{var} = [{item}(_item) for _item in {var}]")
+            return lines
+        elif origin is dict:
+            lines = [f"{pad}if {var}.__class__ is not dict:", f"{pad}    _fail({path!r}, 'object', {var})"]
+            if coerce:
+                lines[1:1] = [f"{pad}    if {var} is None or {var} == '':", f"{pad}        {var} = {{}}",
+                              f"{pad}    else:"]
+                lines[-1] = '    ' + lines[-1]
+            item = self.converter(args[1] if args else Any, f"{path}[]", coerce)
+            if item is not None:
+                lines.append(f"{pad}{var} = {{_key: {item}(_item) for _key, _item in {var}.items()}}")
+            return lines
+        else:
+            schema = _nested_schema(tp)
+            if schema is not None:
+                method = 'decode_text' if coerce else 'decode'
+                return [f"{pad}{var} = {self.bind(schema, 'schema')}.{method}({var})"]
+        raise TypeError(f"Unsupported field type for a record schema: {tp!r}")
+
+    def converter(self, tp: Any, path: str, coerce: bool) -> Optional[str]:
+        """Compiles a one-value converter for container items and returns its name, or None if none is needed."""
+        lines = self.decode_lines(tp, 'value', path, coerce, 4)
+        if not lines:
+            return None
+        name = self.bind(None, 'convert')
+        self.define('\n'.join([f"def {name}(value):"] + lines + ["    return value"]), name)
+        return name
+
+
+class RecordSchema:
+    """
+    Encoder and decoder for one dataclass or TypedDict, generated once from its type hints.
+
+    `encode` turns a record into JSON-compatible builtins with direct field
+    access, `decode` rebuilds it from parsed JSON and raises DeserializationError
+    on missing or mistyped fields, and `decode_text` does the same for XML,
+    where scalars arrive as strings and are coerced to the declared types.
+    Supported field types are str, int, float, bool, None, datetime, date,
+    Decimal, bytes, Optional, List, Dict, Any and other records.
+    """
+
+    def __init__(self, cls: type):
+        if not (dataclasses.is_dataclass(cls) or _is_typed_dict(cls)):
+            raise TypeError(f"{cls!r} is not a dataclass or TypedDict.")
+        self.cls = cls
+        self.name = cls.__name__
+        self.encode: Callable[[Any], Dict[str, Any]] = None
+        self.decode: Callable[[Dict[str, Any]], Any] = None
+        self.decode_text: Callable[[Dict[str, Any]], Any] = None
+
+    def _compile(self) -> None:
+        cls = self.cls
+        # The class itself is passed so self-references resolve while it is still being decorated.
+        hints = typing.get_type_hints(cls, localns={cls.__name__: cls})
+        compiler = _Compiler()
+        # Each field is (name, type, required, default expression).
+        fields: List[Tuple[str, Any, bool, Optional[str]]] = []
+        if dataclasses.is_dataclass(cls):
+            for field in dataclasses.fields(cls):
+                if not field.init:
+                    continue
+                if field.default is not dataclasses.MISSING:
+                    default = compiler.bind(field.default, 'default')
+                elif field.default_factory is not dataclasses.MISSING:
+                    default = f"{compiler.bind(field.default_factory, 'factory')}()"
+                else:
+                    default = None
+                fields.append((field.name, hints[field.name], True, default))
+            access = 'obj.{}'
+        else:
+            for name, tp in hints.items():
+                fields.append((name, tp, name in cls.__required_keys__, None))
+            access = 'obj[{!r}]'
+
+        lines = ["def encode(obj):", "    data = {"]
+        for name, tp, required, _ in fields:
+            if required:
+                lines.append(f"        {name!r}: {compiler.encode_expr(tp, access.format(name))},")
+        lines.append("    }")
+        for name, tp, required, _ in fields:
+            if not required:
+                lines += [f"    if {name!r} in obj:",
+                          f"        data[{name!r}] = {compiler.encode_expr(tp, access.format(name))}"]
+        lines.append("    return data")
+        self.encode = compiler.define('\n'.join(lines), 'encode')
+
+        record = compiler.bind(cls, 'cls')
+        for function, coerce in (('decode', False), ('decode_text', True)):
+            lines = [f"def {function}(data):",
+                     "    if data.__class__ is not dict:",
+                     f"        _fail({self.name!r}, 'object', data)"]
+            for index, (name, tp, required, default) in enumerate(fields):
+                var, path = f"f{index}", f"{self.name}.{name}"
+                if coerce and required and _is_list_type(tp):
+                    # XML has no element for an empty list.
+                    fallback = '[]'
+                elif default is not None:
+                    fallback = default
+                elif required:
+                    fallback = f"_missing({path!r})"
+                else:
+                    fallback = '_MISSING'
+                lines += ["    try:", f"        {var} = data[{name!r}]",
+                          "    except KeyError:", f"        {var} = {fallback}"]
+                checks = compiler.decode_lines(tp, var, path, coerce, 8)
+                if checks:
+                    lines += ["    else:"] + checks
+            if dataclasses.is_dataclass(cls):
+                arguments = ', '.join(f"{name}=f{index}" for index, (name, _, _, _) in enumerate(fields))
+                lines.append(f"    return {record}({arguments})")
+            else:
+                items = ', '.join(f"{name!r}: f{index}" for index, (name, _, required, _) in enumerate(fields)
+                                  if required)
+                lines.append(f"    result = {{{items}}}")
+                for index, (name, _, required, _) in enumerate(fields):
+                    if not required:
+                        lines += [f"    if f{index} is not _MISSING:", f"        result[{name!r}] = f{index}"]
+                lines.append("    return result")
+            setattr(self, function, compiler.define('\n'.join(lines), function))
+
+
+_SCHEMAS: Dict[type, RecordSchema] = {}
+_SCHEMAS_LOCK = threading.RLock()
+
+
+def schema_for(cls: type) -> RecordSchema:
+    """Returns the compiled schema for a dataclass or TypedDict, compiling and registering it on first use."""
+    schema = _SCHEMAS.get(cls)
+    if schema is not None:
+        return schema
+    with _SCHEMAS_LOCK:
+        schema = _SCHEMAS.get(cls)
+        if schema is None:
+            schema = RecordSchema(cls)
+            # Registered before compiling so self-referencing and mutually nested records resolve.
+            _SCHEMAS[cls] = schema
+            try:
+                schema._compile()
+            except Exception:
+                del _SCHEMAS[cls]
+                raise
+            Logger.debug("Compiled record schema for %s.", schema.name)
+        return schema
+
+
+def register_schema(cls: type) -> type:
+    """Class decorator (or plain call) that compiles a record schema, so the serializers encode and decode `cls` with it."""
+    schema_for(cls)
+    return cls
+
+
+def _nested_schema(tp: Any) -> Optional[RecordSchema]:
+    if dataclasses.is_dataclass(tp) or _is_typed_dict(tp):
+        return schema_for(tp)
+    return None
+
+
+def _encode_records(data: Any, cls: type) -> Any:
+    encode = schema_for(cls).encode
+    if isinstance(data, list):
+        return [encode(item) for item in data]
+    return encode(data)
+
+
+def _decode_records(data: Any, cls: type, coerce: bool = False) -> Any:
+    schema = schema_for(cls)
+    decode = schema.decode_text if coerce else schema.decode
+    if isinstance(data, list):
+        return [decode(item) for item in data]
+    return decode(data)
+
+
+def _plain_default(value: Any) -> Any:
+    schema = _SCHEMAS.get(type(value))
+    return schema.encode(value) if schema is not None else str(value)
+
+
+# Tagged representations used by JsonSerializer(typed=True) so these types survive a round trip.
+_TYPE_TAG = '$type'
+_JSON_ENCODERS: Dict[type, Callable[[Any], Dict[str, str]]] = {
+    datetime: lambda value: {_TYPE_TAG: 'datetime', 'value': value.isoformat()},
+    date: lambda value: {_TYPE_TAG: 'date', 'value': value.isoformat()},
+    Decimal: lambda value: {_TYPE_TAG: 'decimal', 'value': str(value)},
+    bytes: lambda value: {_TYPE_TAG: 'bytes', 'value': base64.b64encode(value).decode('ascii')},
+}
+_JSON_DECODERS: Dict[str, Callable[[str], Any]] = {
+    'datetime': datetime.fromisoformat,
+    'date': date.fromisoformat,
+    'decimal': Decimal,
+    'bytes': base64.b64decode,
+}
+
+
+def _finite(value: Any) -> Any:
+    """Replaces NaN and infinities with None, the way orjson writes them."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _typed_default(value: Any) -> Any:
+    encoder = _JSON_ENCODERS.get(type(value))
+    return encoder(value) if encoder is not None else _plain_default(value)
+
+
+def _typed_hook(obj: Dict[str, Any]) -> Any:
+    tag = obj.get(_TYPE_TAG)
+    if tag is not None and len(obj) == 2 and tag in _JSON_DECODERS:
+        return _JSON_DECODERS[tag](obj['value'])
+    return obj
+
+
+def _revive(value: Any) -> Any:
+    if isinstance(value, dict):
+        value = {key: _revive(item) for key, item in value.items()}
+        return _typed_hook(value)
+    if isinstance(value, list):
+        return [_revive(item) for item in value]
+    return value
+
 
 class JsonSerializer(BaseSerializer):
-    def serialize(self, data: Any) -> str:
+    def __init__(self, typed: bool = False, backend: Optional[str] = None):
+        """
+        JSON serializer that uses orjson when it is installed and the stdlib json module otherwise.
+
+        `backend` forces 'orjson' or 'json'. Both write NaN and infinities as null,
+        which is what orjson does. By default values JSON cannot represent are
+        written with `str()`; with `typed=True`, datetime, date, Decimal and
+        bytes are written as small tagged objects and restored on deserialize.
+        Instances of registered record types are written with their compiled
+        schema, and `cls=` on the load methods decodes into them.
+        """
+        if backend not in (None, 'orjson', 'json'):
+            raise ValueError(f"Unknown JSON backend: {backend}. Use 'orjson' or 'json'.")
+        self.typed = typed
+        self._default = _typed_default if typed else _plain_default
+        self._orjson = None
+        if backend != 'json':
+            try:
+                import orjson
+            except ImportError:
+                if backend == 'orjson':
+                    raise
+            else:
+                self._orjson = orjson
+                # Route datetimes and dataclasses through `default` so both backends produce the same output.
+                self._options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                                 | orjson.OPT_NON_STR_KEYS)
+        self.backend = 'json' if self._orjson is None else 'orjson'
+
+    def _encode(self, data: Any) -> bytes:
+        if self._orjson is not None:
+            try:
+                return self._orjson.dumps(data, default=self._default, option=self._options)
+            except self._orjson.JSONEncodeError:
+                pass  # e.g. integers beyond 64 bits, which the stdlib encoder handles
         try:
-            json_data = json.dumps(data, default=str)
-            Logger.info("Successfully serialized data to JSON.")
-            return json_data
-        except (TypeError, ValueError) as e:
-            Logger.error(f"Failed to serialize data to JSON: {e}")
+            text = json.dumps(data, default=self._default, separators=(',', ':'), ensure_ascii=False,
+                              allow_nan=False)
+        except ValueError:
+            # Non-finite floats are rare, so they are only looked for once the fast path has refused them.
+            default = self._default
+            text = json.dumps(_finite(data), default=lambda value: _finite(default(value)), separators=(',', ':'),
+                              ensure_ascii=False, allow_nan=False)
+        return text.encode('utf-8')
+
+    def _decode(self, data: Union[bytes, str]) -> Any:
+        if self._orjson is not None:
+            try:
+                value = self._orjson.loads(data)
+            except self._orjson.JSONDecodeError:
+                pass  # retried below so both backends accept the same documents
+            else:
+                return _revive(value) if self.typed else value
+        return json.loads(data, object_hook=_typed_hook if self.typed else None)
+
+    def dumps(self, data: Any, cls: Optional[type] = None) -> bytes:
+        try:
+            payload = self._encode(data if cls is None else _encode_records(data, cls))
+        except (TypeError, ValueError, AttributeError, KeyError) as e:
+            Logger.error("Failed to serialize data to JSON: %s", e)
             raise SerializationError(f"Failed to serialize data to JSON: {e}")
+        Logger.debug("Successfully serialized data to JSON.")
+        return payload
 
-    def deserialize(self, json_string: str) -> Any:
+    def loads(self, data: Union[bytes, bytearray, memoryview, str], cls: Optional[type] = None) -> Any:
+        """Parses JSON, then builds `cls` records from it (or a list of them) when `cls` is given."""
         try:
-            data = json.loads(json_string)
-            Logger.info("Successfully deserialized data from JSON.")
-            return data
-        except (json.JSONDecodeError, TypeError) as e:
-            Logger.error(f"Failed to deserialize data from JSON: {e}")
+            value = self._decode(data if isinstance(data, (bytes, str)) else bytes(data))
+            if cls is not None:
+                value = _decode_records(value, cls)
+        except (ValueError, TypeError, DeserializationError) as e:
+            Logger.error("Failed to deserialize data from JSON: %s", e)
             raise DeserializationError(f"Failed to deserialize data from JSON: {e}")
+        Logger.debug("Successfully deserialized data from JSON.")
+        return value
+
+    def serialize(self, data: Any, cls: Optional[type] = None) -> str:
+        return self.dumps(data, cls).decode('utf-8')
+
+    def deserialize(self, json_string: str, cls: Optional[type] = None) -> Any:
+        return self.loads(json_string, cls)
+
+
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_DECIMAL = 3
+_EXT_BIGINT = 4
+
+
+def _pack_ext(value: Any) -> Any:
+    import msgpack
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode('ascii'))
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode('ascii'))
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode('ascii'))
+    if isinstance(value, int):
+        return msgpack.ExtType(_EXT_BIGINT, str(value).encode('ascii'))
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable to MessagePack")
+
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    import msgpack
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode('ascii'))
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode('ascii'))
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode('ascii'))
+    if code == _EXT_BIGINT:
+        return int(data)
+    return msgpack.ExtType(code, data)
+
+
+class BinarySerializer(BaseSerializer):
+    def __init__(self):
+        """
+        MessagePack serializer producing bytes instead of text.
+
+        bytes round-trip natively, and datetime, date, Decimal and integers beyond
+        64 bits as extension types; tuples come back as lists. Other types raise SerializationError.
+        """
+        import msgpack
+        self._msgpack = msgpack
+        self._local = threading.local()
+
+    def _packer(self) -> Any:
+        packer = getattr(self._local, 'packer', None)
+        if packer is None:
+            packer = self._local.packer = self._msgpack.Packer(default=_pack_ext, use_bin_type=True, autoreset=False)
+        return packer
+
+    def dumps(self, data: Any) -> bytes:
+        try:
+            payload = self._msgpack.packb(data, default=_pack_ext, use_bin_type=True)
+        except (TypeError, ValueError, OverflowError) as e:
+            Logger.error("Failed to serialize data to MessagePack: %s", e)
+            raise SerializationError(f"Failed to serialize data to MessagePack: {e}")
+        Logger.debug("Successfully serialized data to MessagePack.")
+        return payload
+
+    def dumps_into(self, data: Any, buffer: Buffer, offset: int = 0) -> int:
+        # Packs into a reusable per-thread packer buffer and copies from it, without an intermediate bytes object.
+        packer = self._packer()
+        try:
+            packer.pack(data)
+            with packer.getbuffer() as view:
+                end = _write_buffer(view, buffer, offset)
+        except (TypeError, ValueError, OverflowError) as e:
+            Logger.error("Failed to serialize data to MessagePack: %s", e)
+            raise SerializationError(f"Failed to serialize data to MessagePack: {e}")
+        finally:
+            packer.reset()
+        Logger.debug("Successfully serialized data to MessagePack.")
+        return end
+
+    def loads(self, data: Union[bytes, bytearray, memoryview]) -> Any:
+        try:
+            value = self._msgpack.unpackb(data, raw=False, ext_hook=_unpack_ext, strict_map_key=False)
+        except (TypeError, ValueError) as e:
+            Logger.error("Failed to deserialize data from MessagePack: %s", e)
+            raise DeserializationError(f"Failed to deserialize data from MessagePack: {e}")
+        Logger.debug("Successfully deserialized data from MessagePack.")
+        return value
+
+    def serialize(self, data: Any) -> bytes:
+        return self.dumps(data)
+
+    def deserialize(self, data: Union[bytes, bytearray, memoryview]) -> Any:
+        return self.loads(data)
+
+
+_XSI_NIL = '{http://www.w3.org/2001/XMLSchema-instance}nil'
+
+
+def _element_value(element: ET.Element) -> Any:
+    if len(element):
+        return xml_to_dict(element)
+    if element.get(_XSI_NIL) == 'true':
+        return None
+    return element.text or ''
+
+
+def _set_text(element: ET.Element, value: Any) -> None:
+    if value is None:
+        element.set(_XSI_NIL, 'true')
+    else:
+        element.text = str(value)
+
+
+def xml_to_dict(element: ET.Element) -> Dict[str, Any]:
+    """
+    Converts an element's children to a dict; leaves become their text and repeated sibling tags become lists.
+
+    Elements marked `xsi:nil="true"` become None and other empty elements ''.
+    """
+    data: Dict[str, Any] = {}
+    for child in element:
+        value = _element_value(child)
+        if child.tag not in data:
+            data[child.tag] = value
+        elif isinstance(data[child.tag], list):
+            data[child.tag].append(value)
+        else:
+            data[child.tag] = [data[child.tag], value]
+    return data
+
+
+def dict_to_xml(data: Dict[str, Any], parent: ET.Element) -> None:
+    """
+    Appends `data` to `parent` as child elements; lists become repeated tags and registered records are encoded.
+
+    None is written as an empty element marked `xsi:nil="true"`; an empty list writes no element.
+    """
+    for key, value in data.items():
+        schema = _SCHEMAS.get(type(value))
+        if schema is not None:
+            value = schema.encode(value)
+        if isinstance(value, dict):
+            child = ET.SubElement(parent, key)
+            dict_to_xml(value, child)
+        elif isinstance(value, list):
+            for item in value:
+                schema = _SCHEMAS.get(type(item))
+                if schema is not None:
+                    item = schema.encode(item)
+                item_elem = ET.SubElement(parent, key)
+                if isinstance(item, dict):
+                    dict_to_xml(item, item_elem)
+                else:
+                    _set_text(item_elem, item)
+        else:
+            _set_text(ET.SubElement(parent, key), value)
+
+
+def iter_xml(source: Union[str, IO], path: str) -> Iterator[Any]:
+    """
+    Streams the elements at `path` (tags below the root, e.g. 'items/item') as dicts.
+
+    Built on iterparse: each matching element is converted once it is closed and
+    then cleared and detached, as is everything outside a match, so memory use
+    follows the size of one record rather than the whole document.
+    """
+    parts = path.strip('/').split('/')
+    stack: List[ET.Element] = []
+    inside = False
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            stack.append(element)
+            if not inside and len(stack) == len(parts) + 1 and [e.tag for e in stack[1:]] == parts:
+                inside = True
+            continue
+        stack.pop()
+        if inside:
+            if len(stack) != len(parts):
+                continue
+            inside = False
+            yield _element_value(element)
+        element.clear()
+        if stack:
+            del stack[-1][-1]
+
+
+class XmlWriter:
+    """
+    Writes records as repeated `item_tag` children of one root element, one at a time.
+
+    Only the record being written is ever built as an element, so the output can
+    be far larger than memory. `target` is a path or a text file object.
+    """
+
+    def __init__(self, target: Union[str, IO[str]], root_tag: str = 'root', item_tag: str = 'item',
+                 encoding: str = 'utf-8'):
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        self._file = open(target, 'w', encoding=encoding) if self._owns_file else target
+        self.root_tag = root_tag
+        self.item_tag = item_tag
+        self.count = 0
+        self._file.write(f"<?xml version='1.0' encoding='{encoding}'?>\n<{root_tag}>")
+
+    def write(self, record: Any) -> None:
+        schema = _SCHEMAS.get(type(record))
+        if schema is not None:
+            record = schema.encode(record)
+        element = ET.Element(self.item_tag)
+        if isinstance(record, dict):
+            dict_to_xml(record, element)
+        else:
+            _set_text(element, record)
+        self._file.write(ET.tostring(element, encoding='unicode'))
+        self.count += 1
+
+    def write_many(self, records: Iterable[Any]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.write(f"</{self.root_tag}>\n")
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+        self._file = None
+
+    def __enter__(self) -> 'XmlWriter':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
 
 
 class XmlSerializer(BaseSerializer):
-    def serialize(self, data: Dict[str, Any], root_tag: str = 'root') -> str:
+    def serialize(self, data: Any, root_tag: str = 'root') -> str:
         try:
+            schema = _SCHEMAS.get(type(data))
+            if schema is not None:
+                data = schema.encode(data)
             root = ET.Element(root_tag)
-            self._dict_to_xml(data, root)
+            dict_to_xml(data, root)
             xml_string = ET.tostring(root, encoding='unicode')
-            Logger.info("Successfully serialized data to XML.")
+            Logger.debug("Successfully serialized data to XML.")
             return xml_string
         except Exception as e:
-            Logger.error(f"Failed to serialize data to XML: {e}")
+            Logger.error("Failed to serialize data to XML: %s", e)
             raise SerializationError(f"Failed to serialize data to XML: {e}")
 
-    def deserialize(self, xml_string: str) -> Dict[str, Any]:
+    def deserialize(self, xml_string: str, cls: Optional[type] = None) -> Any:
+        """Parses XML into a dict, or into a `cls` record with its text values coerced to the field types."""
         try:
             root = ET.fromstring(xml_string)
-            data = self._xml_to_dict(root)
-            Logger.info("Successfully deserialized data from XML.")
+            data = xml_to_dict(root)
+            if cls is not None:
+                data = _decode_records(data, cls, coerce=True)
+            Logger.debug("Successfully deserialized data from XML.")
             return data
-        except ET.ParseError as e:
-            Logger.error(f"Failed to deserialize data from XML: {e}")
+        except (ET.ParseError, DeserializationError) as e:
+            Logger.error("Failed to deserialize data from XML: %s", e)
             raise DeserializationError(f"Failed to deserialize data from XML: {e}")
 
-    @staticmethod
-    def _dict_to_xml(data: Dict[str, Any], parent: ET.Element) -> None:
-        for key, value in data.items():
-            if isinstance(value, dict):
-                child = ET.SubElement(parent, key)
-                XmlSerializer._dict_to_xml(value, child)
-            elif isinstance(value, list):
-                for item in value:
-                    item_elem = ET.SubElement(parent, key)
-                    if isinstance(item, dict):
-                        XmlSerializer._dict_to_xml(item, item_elem)
-                    else:
-                        item_elem.text = str(item)
-            else:
-                child = ET.SubElement(parent, key)
-                child.text = str(value)
-
-    @staticmethod
-    def _xml_to_dict(element: ET.Element) -> Dict[str, Any]:
-        data = {}
-        for child in element:
-            if len(child) > 0:
-                data[child.tag] = XmlSerializer._xml_to_dict(child)
-            else:
-                data[child.tag] = child.text
-        return data
+    def iter_records(self, source: Union[str, IO], path: str, cls: Optional[type] = None) -> Iterator[Any]:
+        """Streams the elements at `path` from a file path or file object, as dicts or `cls` records."""
+        decode = schema_for(cls).decode_text if cls is not None else None
+        try:
+            for record in iter_xml(source, path):
+                yield decode(record) if decode is not None else record
+        except (ET.ParseError, DeserializationError) as e:
+            Logger.error("Failed to deserialize data from XML: %s", e)
+            raise DeserializationError(f"Failed to deserialize data from XML: {e}")
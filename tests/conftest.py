@@ -0,0 +1,17 @@
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+# The modules import each other as `pyutils.<package>.<module>`; make this checkout
+# importable under that name whatever its directory is called.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if 'pyutils' not in sys.modules:
+    _spec = importlib.machinery.ModuleSpec('pyutils', None, is_package=True)
+    _package = importlib.util.module_from_spec(_spec)
+    _package.__path__ = [ROOT]
+    sys.modules['pyutils'] = _package
+
+from pyutils.logger.logger import Logger  # noqa: E402
+
+Logger.set_level('WARNING')
@@ -0,0 +1,125 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from pyutils.apiclient.client import AsyncHttpClient
+
+aiohttp = pytest.importorskip('aiohttp')
+web = pytest.importorskip('aiohttp.web')
+
+
+class _Upstream:
+    """Local aiohttp app that records hits and the peak number of requests in flight."""
+
+    def __init__(self, flaky_failures=2):
+        self.hits = {}
+        self.in_flight = 0
+        self.peak = 0
+        self.flaky_failures = flaky_failures
+        self.app = web.Application()
+        self.app.router.add_get('/echo/{i}', self.echo)
+        self.app.router.add_get('/flaky', self.flaky)
+        self.app.router.add_get('/slow', self.slow)
+
+    def _hit(self, name):
+        self.hits[name] = self.hits.get(name, 0) + 1
+        return self.hits[name]
+
+    async def echo(self, request):
+        i = int(request.match_info['i'])
+        self._hit('echo')
+        # Later requests answer first, so completion order differs from input order.
+        await asyncio.sleep(0.002 * (20 - i % 20))
+        return web.json_response({'i': i})
+
+    async def flaky(self, request):
+        if self._hit('flaky') <= self.flaky_failures:
+            return web.json_response({'error': 'unavailable'}, status=503)
+        return web.json_response({'ok': True})
+
+    async def slow(self, request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            return web.json_response({'ok': True})
+        finally:
+            self.in_flight -= 1
+
+
+@asynccontextmanager
+async def _serve(upstream, **client_kwargs):
+    runner = web.AppRunner(upstream.app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    client = AsyncHttpClient(f"http://127.0.0.1:{port}", **client_kwargs)
+    try:
+        yield client
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+def test_gather_many_keeps_input_order_and_captures_errors():
+    upstream = _Upstream()
+
+    async def main():
+        async with _serve(upstream, max_retries=1) as client:
+            calls = [('GET', f'/echo/{i}') for i in range(40)]
+            calls.insert(7, ('GET', '/missing'))
+            return await client.gather_many(calls, concurrency=8)
+
+    results = asyncio.run(main())
+    assert len(results) == 41
+    assert isinstance(results[7], aiohttp.ClientResponseError)
+    assert [result['i'] for result in results[:7] + results[8:]] == list(range(40))
+
+
+def test_request_retries_5xx_until_success():
+    upstream = _Upstream(flaky_failures=2)
+
+    async def main():
+        async with _serve(upstream, max_retries=3, retry_delay=0.01) as client:
+            return await client.get('/flaky')
+
+    assert asyncio.run(main()) == {'ok': True}
+    assert upstream.hits['flaky'] == 3
+
+
+def test_request_gives_up_after_max_retries():
+    upstream = _Upstream(flaky_failures=10)
+
+    async def main():
+        async with _serve(upstream, max_retries=2, retry_delay=0.01) as client:
+            return await client.gather_many([('GET', '/flaky')])
+
+    results = asyncio.run(main())
+    assert isinstance(results[0], aiohttp.ClientResponseError)
+    assert results[0].status == 503
+    assert upstream.hits['flaky'] == 2
+
+
+def test_gather_many_bounds_concurrency():
+    upstream = _Upstream()
+
+    async def main():
+        async with _serve(upstream) as client:
+            return await client.gather_many([('GET', '/slow')] * 50, concurrency=5)
+
+    results = asyncio.run(main())
+    assert results == [{'ok': True}] * 50
+    assert upstream.peak == 5
+
+
+def test_max_concurrency_bounds_requests_in_flight():
+    upstream = _Upstream()
+
+    async def main():
+        async with _serve(upstream, max_concurrency=4) as client:
+            return await asyncio.gather(*(client.get('/slow') for _ in range(30)))
+
+    assert asyncio.run(main()) == [{'ok': True}] * 30
+    assert upstream.peak == 4
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pyutils.cachingutils.caching import Cache, RedisCache, TieredCache
+
+
+N = 20
+
+
+def test_single_flight_sync_makes_one_call():
+    cache = Cache()
+    calls = []
+    barrier = threading.Barrier(N)
+
+    @cache.cached_function(single_flight=True)
+    def load(key):
+        calls.append(key)
+        time.sleep(0.2)
+        return key * 2
+
+    results = [None] * N
+
+    def caller(i):
+        barrier.wait()
+        results[i] = load(21)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(N)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [21]
+    assert results == [42] * N
+
+
+def test_single_flight_async_makes_one_call():
+    cache = Cache()
+    calls = []
+
+    @cache.cached_function(single_flight=True)
+    async def load(key):
+        calls.append(key)
+        await asyncio.sleep(0.1)
+        return key * 2
+
+    async def main():
+        return await asyncio.gather(*(load(21) for _ in range(N)))
+
+    assert asyncio.run(main()) == [42] * N
+    assert calls == [21]
+
+
+def test_single_flight_async_shares_the_exception():
+    cache = Cache()
+    calls = []
+
+    @cache.cached_function(single_flight=True)
+    async def load(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        raise ValueError(key)
+
+    async def main():
+        return await asyncio.gather(*(load(1) for _ in range(N)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    cache = Cache()
+    calls = []
+
+    @cache.cached_function(single_flight=True)
+    async def load(key):
+        calls.append(key)
+        await asyncio.sleep(0.1)
+        return key * 2
+
+    async def main():
+        leader = asyncio.ensure_future(load(21))
+        await asyncio.sleep(0)  # the leader claims the flight
+        followers = [asyncio.ensure_future(load(21)) for _ in range(5)]
+        await asyncio.sleep(0.02)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader, results
+
+    leader, results = asyncio.run(main())
+    assert leader.cancelled()
+    assert results == [42] * 5
+    # The cancelled call plus exactly one takeover by a follower.
+    assert calls == [21, 21]
+
+
+def _tiered_pair():
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+    return [TieredCache(RedisCache(codec='pickle', client=fakeredis.FakeRedis(server=server)), listen=False)
+            for _ in range(2)]
+
+
+def test_tiered_cache_reads_same_value_across_instances():
+    writer, reader = _tiered_pair()
+    writer.set('k', 5)
+    writer.set_many({'a': [1, 2], 'b': 'text'})
+    assert writer.get('k') == 5
+    assert reader.get('k') == 5
+    assert reader.get_many(['a', 'b', 'c']) == {'a': [1, 2], 'b': 'text'}
+
+
+def test_tiered_cache_tells_stored_none_from_miss():
+    writer, reader = _tiered_pair()
+    writer.set('k', None)
+    assert reader.get('k', 'default') is None
+    assert reader.get('missing', 'default') == 'default'
+
+
+def test_tiered_cache_rejects_l2_without_codec():
+    fakeredis = pytest.importorskip('fakeredis')
+    with pytest.raises(ValueError):
+        TieredCache(RedisCache(client=fakeredis.FakeRedis()), listen=False)
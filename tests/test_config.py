@@ -0,0 +1,11 @@
+from pyutils.configurator.config import Config
+
+
+def test_get_does_not_cache_misses():
+    config = Config()
+    config.config_data = {'db': {'pool': {'size': 5}}}
+    for i in range(1000):
+        assert config.get(f'user.{i}', 'default') == 'default'
+    assert config.get('db.pool.size') == 5
+    assert len(config._snapshot.cache) == 1
+
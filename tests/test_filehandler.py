@@ -0,0 +1,21 @@
+import pytest
+
+from pyutils.filehandler.filehandler import CsvFileHandler
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('id,score,active\n1,0.5,True\n2,,False\n')
+    return str(path)
+
+
+def test_read_columns_parses_schema_types(csv_path):
+    columns = CsvFileHandler().read_columns(csv_path, {'id': int, 'active': bool}, use_numpy=False)
+    assert list(columns['id']) == [1, 2]
+    assert list(columns['active']) == [1, 0]
+
+
+def test_read_columns_rejects_empty_schema(csv_path):
+    with pytest.raises(ValueError):
+        CsvFileHandler().read_columns(csv_path, {})
@@ -0,0 +1,71 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from pyutils.apiclient.client import HttpClient
+from pyutils.retrylogic.retry import CircuitBreaker
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        status = int(self.path.strip('/'))
+        body = json.dumps({'status': status}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.hits = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, **kwargs):
+    return HttpClient(f"http://127.0.0.1:{server.server_address[1]}", retry_delay=0.0, **kwargs)
+
+
+def test_client_errors_are_not_retried(server):
+    with _client(server, max_retries=3) as client:
+        with pytest.raises(requests.HTTPError):
+            client.get('/404')
+        with pytest.raises(requests.HTTPError):
+            client.get('/503')
+    assert server.hits == {'/404': 1, '/503': 3}
+
+
+def test_breaker_counts_only_dependency_failures_and_is_left_unchanged(server):
+    breaker = CircuitBreaker(failure_threshold=2)
+    with _client(server, max_retries=1, circuit_breaker=breaker) as client:
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                client.get('/404')
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.is_failure is None
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                client.get('/500')
+        assert breaker.state == CircuitBreaker.OPEN
+
+    # Direct use of the same breaker still counts every error.
+    shared = CircuitBreaker(failure_threshold=1)
+    _client(server, circuit_breaker=shared).close()
+    with pytest.raises(ValueError):
+        shared.call(int, 'x')
+    assert shared.state == CircuitBreaker.OPEN
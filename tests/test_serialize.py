@@ -0,0 +1,46 @@
+import dataclasses
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+
+from pyutils.serliazerserializer.serialize import JsonSerializer, XmlSerializer, register_schema
+
+
+@register_schema
+@dataclasses.dataclass
+class Person:
+    name: Optional[str]
+    nickname: str = ''
+    tags: List[str] = dataclasses.field(default_factory=list)
+    scores: Optional[List[int]] = None
+
+
+@pytest.mark.parametrize('record', [
+    Person(name=''),
+    Person(name='None'),
+    Person(name=None),
+    Person(name='a', nickname='None', tags=[]),
+    Person(name='a', tags=['', 'None'], scores=[]),
+    Person(name='a', tags=['x'], scores=[1, 2]),
+])
+def test_xml_record_round_trip(record):
+    serializer = XmlSerializer()
+    assert serializer.deserialize(serializer.serialize(record), cls=Person) == record
+
+
+def test_xml_dict_round_trip_keeps_none_apart_from_text():
+    serializer = XmlSerializer()
+    data = {'null': None, 'empty': '', 'text': 'None'}
+    assert serializer.deserialize(serializer.serialize(data)) == data
+
+
+@pytest.mark.parametrize('data', [
+    {'nan': float('nan'), 'inf': float('inf'), 'neg': [float('-inf'), 1.5], 'nested': {'t': (float('nan'),)}},
+    {'big': 2 ** 70, 'nan': float('nan')},
+    {'when': datetime(2024, 1, 2, 3, 4, 5), 'amount': Decimal('1.10'), 'person': Person(name='a')},
+])
+def test_json_backends_write_the_same_bytes(data):
+    pytest.importorskip('orjson')
+    assert JsonSerializer(backend='orjson').dumps(data) == JsonSerializer(backend='json').dumps(data)